@@ -26,6 +26,7 @@ from .npcs import (
     NPC_TYPES,
     NPC_GOALS,
     NPC_ATTITUDES,
+    NPC_TYPE_BY_OBJECT_ID,
     get_npc_type_name,
 )
 from .objects import (
@@ -146,6 +147,7 @@ __all__ = [
     'NPC_TYPES',
     'NPC_GOALS',
     'NPC_ATTITUDES',
+    'NPC_TYPE_BY_OBJECT_ID',
     'get_npc_type_name',
     # Mantras
     'COMPLETE_MANTRAS',
@@ -5,7 +5,8 @@ NPCs use object IDs 0x40-0x7F (64 creature types).
 Mobile objects (indices 0-255) contain NPC-specific data like HP, goals, attitudes.
 """
 
-from typing import Dict
+import sys
+from typing import Dict, Tuple
 
 # NPC type names by object ID (0x40-0x7F)
 NPC_TYPES: Dict[int, str] = {
@@ -103,3 +104,8 @@ def get_npc_type_name(object_id: int) -> str:
     """Get the type name for an NPC object ID."""
     return NPC_TYPES.get(object_id, f"npc_0x{object_id:02X}")
 
+
+# get_npc_type_name for every (9-bit) object ID, for hot loops that can index directly.
+# Interned so the generated "npc_0x.." fallbacks compare by identity like the literals do.
+NPC_TYPE_BY_OBJECT_ID: Tuple[str, ...] = tuple(sys.intern(get_npc_type_name(i)) for i in range(0x200))
+
@@ -2,7 +2,7 @@
 #
 # Export extracted game data to various formats.
 
-from .json_exporter import JsonExporter
+from .json_exporter import JsonExporter, load_json
 
 # XlsxExporter is optional - requires openpyxl
 try:
@@ -14,6 +14,7 @@ except ImportError:
 
 __all__ = [
     'JsonExporter',
+    'load_json',
     'XlsxExporter',
     'XLSX_AVAILABLE',
 ]
@@ -4,11 +4,392 @@ JSON Exporter for Ultima Underworld extracted data.
 Exports all extracted game data to JSON files.
 """
 
+import contextlib
+import gc
 import json
+import os
+from collections import Counter, defaultdict
 from pathlib import Path
 from typing import Dict, List, Any
 from datetime import datetime
 
+from ..constants import CARRYABLE_CONTAINERS, STATIC_CONTAINERS
+
+# Object IDs of every container type (portable and static), for single membership tests
+_ALL_CONTAINERS = frozenset(CARRYABLE_CONTAINERS) | frozenset(STATIC_CONTAINERS)
+
+# Object classes still shown on the web map when invisible (game mechanics)
+_INVISIBLE_KEEP = frozenset({'trap', 'trigger'})
+
+# Teleport trap linked from a move trigger (0x1A0) - level transitions are stairs
+_TELEPORT_TRAP_ID = 0x181
+
+# Items that always have a quantity on the web map (gems)
+_QUANTITY_CAPABLE_ITEMS = frozenset({
+    0x0A2,  # Ruby
+    0x0A3,  # Red gem
+    0x0A4,  # Small blue gem (tiny blue gem)
+    0x0A6,  # Sapphire
+    0x0A7,  # Emerald
+})
+
+# Items that never expose ownership on the web map, even with a non-zero raw owner field
+_NEVER_OWNED_ITEMS = frozenset({
+    0x1CA,  # 458 - silver tree
+    0x0C2, 0x0C3,  # skulls
+    0x0C4, 0x0C5,  # bones
+    0x0C6, 0x0DC,  # pile of bones (variants)
+})
+
+
+# Category mapping for objects - maps base/detailed categories to web categories
+_CATEGORY_MAP = {
+    # Weapons
+    'melee_weapon': 'weapons',
+    'ranged_weapon': 'weapons',
+    # Armor
+    'armor': 'armor',
+    # Containers - portable (bags, packs) vs static (barrels, chests, urns)
+    'container': 'containers',
+    'storage': 'storage',
+    # Keys
+    'key': 'keys',
+    # Consumables
+    'food': 'food',
+    'potion': 'potions',
+    # Books & Scrolls - combined into single category
+    'scroll': 'books_scrolls',
+    'book': 'books_scrolls',
+    'readable_scroll': 'books_scrolls',
+    'readable_book': 'books_scrolls',
+    'quest_book': 'quest',  # Quest books like Book of Honesty
+    'spell_scroll': 'spell_scrolls',
+    'map': 'books_scrolls',  # Maps shown with books & scrolls
+    # Light sources
+    'light_source': 'light',
+    # Runes (talismans/virtue keys are quest items)
+    'rune': 'runes',
+    'talisman': 'quest',
+    # Wands
+    'wand': 'wands',
+    'broken_wand': 'misc',  # Broken wands can't cast spells, not magical
+    'spell': 'misc',  # Internal spell objects
+    # Treasure
+    'treasure': 'treasure',
+    # Doors - now split by type
+    'door': 'doors_unlocked',  # Base door category (shouldn't happen, but default to unlocked)
+    'door_locked': 'doors_locked',
+    'door_unlocked': 'doors_unlocked',
+    'secret_door': 'secret_doors',
+    'portcullis': 'doors_unlocked',  # Unlocked portcullis = unlocked door
+    'portcullis_locked': 'doors_locked',
+    'open_portcullis': 'doors_unlocked',  # Open portcullis defaults to unlocked
+    # Traps & Triggers
+    'trap': 'traps',
+    'trigger': 'triggers',
+    # Special objects
+    'special_tmap': 'texture_objects',
+    'switch': 'switches',
+    'furniture': 'furniture',
+    'shrine': 'shrines',
+    'boulder': 'boulders',
+    'decal': 'scenery',
+    'bridge': 'bridges',
+    'gravestones': 'gravestones',
+    'writings': 'writings',
+    'scenery': 'scenery',
+    'useless_item': 'useless_item',
+    'animation': 'animations',
+    # Quest & misc
+    'quest_item': 'quest',
+    'misc_item': 'misc',
+}
+
+
+# Web map filter categories, in display order
+_WEB_CATEGORIES = [
+    # Weapons & Armor
+    {'id': 'weapons', 'name': 'Weapons', 'color': '#e03131'},
+    {'id': 'armor', 'name': 'Armor', 'color': '#5c7cfa'},
+    # Keys & Containers
+    {'id': 'keys', 'name': 'Keys', 'color': '#fab005'},
+    {'id': 'containers', 'name': 'Containers', 'color': '#f08c00'},
+    {'id': 'storage', 'name': 'Storage', 'color': '#d9480f'},
+    # Food & Potions
+    {'id': 'food', 'name': 'Food', 'color': '#a9e34b'},
+    {'id': 'potions', 'name': 'Potions', 'color': '#f783ac'},
+    # Books & Scrolls
+    {'id': 'books_scrolls', 'name': 'Books & Scrolls', 'color': '#e8d4b8'},
+    {'id': 'spell_scrolls', 'name': 'Spell Scrolls', 'color': '#da77f2'},
+    {'id': 'writings', 'name': 'Writings', 'color': '#d4c4a8'},
+    {'id': 'gravestones', 'name': 'Gravestones', 'color': '#c4a484'},
+    # Magic Items - split by type
+    {'id': 'runes', 'name': 'Runestones', 'color': '#9775fa'},
+    {'id': 'wands', 'name': 'Wands', 'color': '#7950f2'},
+    # Treasure & Light
+    {'id': 'treasure', 'name': 'Treasure', 'color': '#fcc419'},
+    {'id': 'light', 'name': 'Light Sources', 'color': '#ffe066'},
+    # Doors
+    {'id': 'doors_locked', 'name': 'Locked Doors', 'color': '#ff6b6b'},
+    {'id': 'doors_unlocked', 'name': 'Unlocked Doors', 'color': '#69db7c'},
+    {'id': 'secret_doors', 'name': 'Secret Doors', 'color': '#ffd43b'},
+    # Mechanics
+    {'id': 'switches', 'name': 'Switches & Levers', 'color': '#ffa94d'},
+    {'id': 'traps', 'name': 'Traps', 'color': '#ff8787'},
+    {'id': 'triggers', 'name': 'Triggers', 'color': '#748ffc'},
+    {'id': 'stairs', 'name': 'Stairs', 'color': '#6c757d'},
+    {'id': 'illusory_walls', 'name': 'Illusory Walls', 'color': '#ff00ff'},
+    # Special Objects
+    {'id': 'texture_objects', 'name': 'Texture Map Objects', 'color': '#845ef7'},
+    {'id': 'furniture', 'name': 'Furniture', 'color': '#b197a8'},
+    {'id': 'shrines', 'name': 'Shrines', 'color': '#d4a574'},
+    {'id': 'boulders', 'name': 'Boulders', 'color': '#8b7355'},
+    {'id': 'bridges', 'name': 'Bridges', 'color': '#8B5A2B'},
+    {'id': 'scenery', 'name': 'Scenery', 'color': '#a9a9a9'},
+    {'id': 'useless_item', 'name': 'Useless Items', 'color': '#868e96'},
+    {'id': 'animations', 'name': 'Animations', 'color': '#20c997'},
+    {'id': 'quest', 'name': 'Quest Items', 'color': '#22b8cf'},
+    {'id': 'misc', 'name': 'Miscellaneous', 'color': '#868e96'},
+]
+
+# Names for the well-known STRINGS.PAK blocks in strings.json
+_STRING_BLOCK_NAMES = {
+    1: 'ui',
+    2: 'chargen_mantras',
+    3: 'scrolls_books',
+    4: 'object_names',
+    5: 'object_look',
+    6: 'spell_names',
+    7: 'npc_names',
+    8: 'wall_text',
+    9: 'trap_messages',
+    10: 'wall_floor_desc',
+    24: 'debug'
+}
+
+
+def _name_for_block(block_num: int) -> str:
+    """Get the strings.json name for a string block number."""
+    name = _STRING_BLOCK_NAMES.get(block_num)
+    if name:
+        return name
+    # Check the higher range first - 0x0E00+ is also >= 0x0C00
+    if block_num >= 0x0E00:
+        return f'conv_strings_{block_num:04X}'
+    if block_num >= 0x0C00:
+        return f'conversation_{block_num:04X}'
+    return f'block_{block_num}'
+
+
+@contextlib.contextmanager
+def _gc_paused():
+    """Disable the cyclic garbage collector for the block, then restore it and collect.
+    
+    The exports build large trees of plain dicts/lists/strs, so generational
+    collections triggered while building them mostly rescan live data. The closures
+    they define do form cycles, so one collection runs once the block is done.
+    Also usable as a decorator (@_gc_paused()).
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        # Leave it off if a caller had already disabled it
+        if was_enabled:
+            gc.enable()
+            gc.collect()
+
+
+# NPC type name -> human-readable faction name (used for item owners)
+_FACTION_MAP = {
+    'green_goblin': 'green goblins',
+    'goblin': 'gray goblins',
+    'outcast': 'outcasts',
+    'rat': 'rats',
+    'bandit': 'bandits',
+    'troll': 'trolls',
+    'skeleton': 'skeletons',
+    'ghoul': 'ghouls',
+    'ghost': 'ghosts',
+    'zombie': 'zombies',
+    'gazer': 'gazers',
+    'mage': 'mages',
+    'dark_mage': 'dark mages',
+    'headless': 'headless',
+    'imp': 'imps',
+    'mongbat': 'mongbats',
+    'dire_ghost': 'dire ghosts',
+    'shadow_beast': 'shadow beasts',
+    'reaper': 'reapers',
+    'wisp': 'wisps',
+    'fire_elemental': 'fire elementals',
+    'golem_stone': 'stone golems',
+    'golem_metal': 'metal golems',
+    'golem_earth': 'earth golems',
+    'lurker': 'lurkers',
+    'deep_lurker': 'deep lurkers',
+    'slime': 'slimes',
+    'vampire_bat': 'vampire bats',
+    'bat': 'bats',
+    'spider': 'spiders',
+    'giant_spider': 'giant spiders',
+    'dread_spider': 'dread spiders',
+    'acid_slug': 'acid slugs',
+    'flesh_slug': 'flesh slugs',
+    'rotworm': 'rotworms',
+    'bloodworm': 'bloodworms',
+    'lizardman': 'lizardmen',
+    'gray_lizardman': 'gray lizardmen',
+    'red_lizardman': 'red lizardmen',
+    'feral_troll': 'feral trolls',
+    'great_troll': 'great trolls',
+    'dark_ghoul': 'dark ghouls',
+    'mountainman': 'mountainmen',
+    'fighter': 'fighters',
+    'knight': 'knights',
+    'mage_female': 'female mages',
+    'mage_red': 'red mages',
+    'tyball': 'Tyball',
+    'slasher': 'slashers',
+    'dragon': 'dragons',
+    'ethereal_void': 'ethereal voids',
+    'daemon': 'daemons',
+    'undead_warrior': 'undead warriors',
+    'garamon': 'Garamon',
+    'dire_reaper': 'dire reapers',
+    'spectre': 'spectres',
+    'liche': 'liches',
+    'demon': 'demons',
+    'mountain_folk': 'mountain folk',
+    'human_male': 'humans',
+    'human_female': 'humans',
+}
+
+
+def _faction_name_from_npc_type(npc_type: str) -> str:
+    """Convert NPC type name to human-readable faction name (e.g. "green_goblin" -> "green goblins")."""
+    # Fall back to converting snake_case to title case
+    return _FACTION_MAP.get(npc_type) or npc_type.replace('_', ' ').title()
+
+
+# Conversation partner names that are bug artifacts rather than real NPC names
+_INVALID_NPC_NAMES = frozenset({'an excellent deal...', 'excellent deal'})
+
+
+def _is_valid_npc_name(name: str) -> bool:
+    """Check if an NPC name is valid (not a bug artifact)."""
+    if not name:
+        return False
+    lower_name = name.lower()
+    return lower_name not in _INVALID_NPC_NAMES and not lower_name.startswith('an excellent deal')
+
+
+# Faction leaders' (lowercase) names -> the faction that owns their items
+_KNOWN_NAME_TO_FACTION = {
+    'marrowsuck': 'green goblins',  # Green goblin leader
+    'vernix': 'gray goblins',       # Gray goblin leader
+    'garamon': 'outcasts',          # Outcast leader
+    'lanugo': 'mountainmen',        # Mountainman leader on level 2
+}
+
+# Level-specific item owner mappings, keyed by (level, owner value); checked before NPC lookup
+_OWNER_OVERRIDE = {
+    (1, 10): 'mountainmen',  # Level 2: Lanugo's conversation slot
+    (2, 11): 'lizardmen',    # Level 3: Thorlson's conversation slot
+    (3, 13): 'knights',      # Level 4: Morlock's conversation slot
+    (3, 15): 'trolls',       # Level 4
+    (3, 31): 'knights',      # Level 4 is "The Knights"
+    (6, 20): 'golems',       # Level 7: Gulik's conversation slot
+}
+
+# Item type properties copied into an object's stats, by (9-bit) object ID
+_STAT_KEYS_BY_ID = tuple(
+    ('slash_damage', 'bash_damage', 'stab_damage', 'durability') if object_id <= 0x0F else  # Melee weapons
+    ('durability',) if object_id <= 0x1F else                                              # Ranged weapons
+    ('protection', 'durability') if object_id <= 0x3F else                                 # Armor
+    ('capacity', 'accepts') if 0x80 <= object_id <= 0x8F else                              # Containers
+    ()
+    for object_id in range(0x200)
+)
+
+# Enchantment classes, used to pick the enchantment effect table for an object
+_ENCH_WEAPON, _ENCH_ARMOR, _ENCH_RING, _ENCH_TREASURE = range(4)
+
+
+def _build_ench_classes(flagged: bool) -> tuple:
+    """Map every (9-bit) object ID to its enchantment class, or None if it has none.
+    
+    flagged selects items with the enchanted flag set; without it only armor and
+    treasure carry enchantment data. Sceptres (0xAA) have their own handling.
+    """
+    classes = [None] * 0x200
+    for object_id in range(0x20, 0x40):
+        classes[object_id] = _ENCH_ARMOR
+    if flagged:
+        for object_id in range(0x20):
+            classes[object_id] = _ENCH_WEAPON
+        for object_id in (0x36, 0x38, 0x39, 0x3A):
+            classes[object_id] = _ENCH_RING
+    for object_id in range(0xA0, 0xB0):
+        if object_id != 0x0AA:
+            classes[object_id] = _ENCH_TREASURE
+    return tuple(classes)
+
+
+_ENCH_CLASS_FLAGGED = _build_ench_classes(True)
+_ENCH_CLASS_UNFLAGGED = _build_ench_classes(False)
+
+# Display names for the 9 levels of the Abyss
+_LEVEL_NAMES = [
+    "Level 1 - The Abyss Entrance",
+    "Level 2 - The Mountainfolk",
+    "Level 3 - The Lizardmen",
+    "Level 4 - The Knights",
+    "Level 5 - The Ghouls",
+    "Level 6 - The Seers",
+    "Level 7 - The Pits",
+    "Level 8 - The Tyball's Domain",
+    "Level 9 - The Chamber of Virtue",
+]
+
+# orjson is optional - much faster serialization of the large export files
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+# zstandard is optional - used for the pre-compressed copy of the web map data
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+# cysimdjson is optional - used only for reading exported files back in
+try:
+    import cysimdjson
+    CYSIMDJSON_AVAILABLE = True
+except ImportError:
+    cysimdjson = None
+    CYSIMDJSON_AVAILABLE = False
+
+
+def load_json(filepath: str | Path) -> Any:
+    """Load a JSON file produced by JsonExporter.
+    
+    Parses with cysimdjson when it is installed (fastest for the read-heavy
+    tools that consume our output), otherwise falls back to the stdlib.
+    Exporting always goes through JsonExporter._write_json.
+    """
+    if CYSIMDJSON_AVAILABLE:
+        return cysimdjson.JSONParser().load(str(filepath)).export()
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
 
 class JsonExporter:
     """
@@ -25,12 +406,76 @@ class JsonExporter:
     def __init__(self, output_path: str | Path):
         self.output_path = Path(output_path)
         self.output_path.mkdir(parents=True, exist_ok=True)
+        # One timestamp for every file written by this exporter. Setting
+        # UU_EXPORT_TIMESTAMP pins it so repeated exports are byte-identical.
+        self._generated = os.environ.get('UU_EXPORT_TIMESTAMP') or datetime.now().isoformat()
+    
+    def _meta(self, type_: str, **extra) -> Dict[str, Any]:
+        """Build the standard metadata block for an exported file."""
+        metadata = {
+            'type': type_,
+            'game': 'Ultima Underworld I',
+            'generated': self._generated,
+        }
+        metadata.update(extra)
+        return metadata
+    
+    def _dumps_orjson(self, data: Any) -> bytes | None:
+        """Serialize with orjson if available, or None to use the json module."""
+        if ORJSON_AVAILABLE:
+            try:
+                # Integer dict keys are written as strings, same as the json module
+                return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            except TypeError:
+                # orjson.JSONEncodeError subclasses TypeError - let json report/handle it
+                pass
+        return None
+    
+    def _serialize_json(self, data: Any) -> bytes:
+        """Serialize data to UTF-8 JSON bytes (2-space indent)."""
+        data_bytes = self._dumps_orjson(data)
+        if data_bytes is None:
+            data_bytes = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+        return data_bytes
     
     def _write_json(self, filename: str, data: Any) -> Path:
         """Write data to a JSON file."""
         filepath = self.output_path / filename
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        data_bytes = self._dumps_orjson(data)
+        if data_bytes is not None:
+            filepath.write_bytes(data_bytes)
+            return filepath
+        # Stream encoder chunks straight to disk instead of building the whole string.
+        # The export data is freshly built dicts/lists, so the circular check is not needed.
+        encoder = json.JSONEncoder(indent=2, ensure_ascii=False, check_circular=False)
+        with open(filepath, 'w', encoding='utf-8', newline='\n') as f:
+            f.writelines(encoder.iterencode(data))
+        return filepath
+    
+    def _write_json_streamed(self, filename: str, data: Dict, stream_key: str, entries) -> Path:
+        """Write data to a JSON file, encoding one large nested dict entry by entry.
+        
+        The (key, value) pairs from entries are written as data[stream_key], after
+        the other top-level keys, so only one entry's encoded bytes are held at a
+        time. Output is identical to _write_json on the fully built dict.
+        """
+        def encode(value, depth: int) -> bytes:
+            # Raw newlines only appear in the indentation (string newlines are escaped)
+            return self._serialize_json(value).replace(b'\n', b'\n' + b'  ' * depth)
+        
+        filepath = self.output_path / filename
+        with open(filepath, 'wb') as f:
+            f.write(b'{')
+            for key, value in data.items():
+                f.write(b'\n  ' + encode(key, 1) + b': ' + encode(value, 1) + b',')
+            f.write(b'\n  ' + encode(stream_key, 1) + b': {')
+            separator = b'\n    '
+            for key, value in entries:
+                f.write(separator + encode(str(key), 2) + b': ' + encode(value, 2))
+                separator = b',\n    '
+            if separator != b'\n    ':
+                f.write(b'\n  ')
+            f.write(b'}\n}')
         return filepath
     
     def export_items(self, item_types: Dict, placed_items: List, image_paths: Dict[int, str] = None) -> None:
@@ -45,24 +490,14 @@ class JsonExporter:
             items_list.append(item_dict)
         
         types_data = {
-            'metadata': {
-                'type': 'item_types',
-                'game': 'Ultima Underworld I',
-                'generated': datetime.now().isoformat(),
-                'count': len(item_types)
-            },
+            'metadata': self._meta('item_types', count=len(item_types)),
             'items': items_list
         }
         self._write_json('items.json', types_data)
         
         # Export placed items
         placed_data = {
-            'metadata': {
-                'type': 'placed_objects',
-                'game': 'Ultima Underworld I',
-                'generated': datetime.now().isoformat(),
-                'count': len(placed_items)
-            },
+            'metadata': self._meta('placed_objects', count=len(placed_items)),
             'objects': [item.to_dict() for item in placed_items]
         }
         self._write_json('placed_objects.json', placed_data)
@@ -70,12 +505,7 @@ class JsonExporter:
     def export_npcs(self, npcs: List, npc_names: Dict = None) -> None:
         """Export NPC data."""
         npc_data = {
-            'metadata': {
-                'type': 'npcs',
-                'game': 'Ultima Underworld I',
-                'generated': datetime.now().isoformat(),
-                'count': len(npcs)
-            },
+            'metadata': self._meta('npcs', count=len(npcs)),
             'npc_names': npc_names or {},
             'npcs': [npc.to_dict() for npc in npcs]
         }
@@ -84,11 +514,7 @@ class JsonExporter:
     def export_spells(self, spells: List, mantras: List, runes: Dict, spell_runes: Dict) -> None:
         """Export spell and mantra data."""
         spell_data = {
-            'metadata': {
-                'type': 'magic',
-                'game': 'Ultima Underworld I',
-                'generated': datetime.now().isoformat()
-            },
+            'metadata': self._meta('magic'),
             'runes': runes,
             'spell_runes': spell_runes,
             'spells': [s.to_dict() for s in spells],
@@ -99,12 +525,7 @@ class JsonExporter:
     def export_secrets(self, secrets: List) -> None:
         """Export secrets data."""
         secrets_data = {
-            'metadata': {
-                'type': 'secrets',
-                'game': 'Ultima Underworld I',
-                'generated': datetime.now().isoformat(),
-                'count': len(secrets)
-            },
+            'metadata': self._meta('secrets', count=len(secrets)),
             'secrets': [s.to_dict() for s in secrets]
         }
         self._write_json('secrets.json', secrets_data)
@@ -112,18 +533,20 @@ class JsonExporter:
     def export_conversations(self, conversations: Dict, strings_parser) -> None:
         """Export conversation data."""
         conv_data = {
-            'metadata': {
-                'type': 'conversations',
-                'game': 'Ultima Underworld I',
-                'generated': datetime.now().isoformat(),
-                'count': len(conversations)
-            },
+            'metadata': self._meta('conversations', count=len(conversations)),
             'conversations': []
         }
         
+        # Exported strings per string block - conversations can share a block
+        block_cache = {}
+        
         for slot, conv in conversations.items():
             # Get dialogue strings from the conversation's string block
-            strings = strings_parser.get_block(conv.string_block) or []
+            string_block = conv.string_block
+            strings = block_cache.get(string_block)
+            if strings is None:
+                strings = (strings_parser.get_block(string_block) or [])[:50]  # First 50 strings
+                block_cache[string_block] = strings
             
             conv_entry = {
                 'slot': slot,
@@ -138,7 +561,7 @@ class JsonExporter:
                     for imp in conv.imports
                 ],
                 'code_size': len(conv.code),
-                'strings': strings[:50]  # First 50 strings
+                'strings': strings
             }
             conv_data['conversations'].append(conv_entry)
         
@@ -147,22 +570,15 @@ class JsonExporter:
     def export_map_data(self, levels: Dict) -> None:
         """Export map/level data."""
         map_data = {
-            'metadata': {
-                'type': 'maps',
-                'game': 'Ultima Underworld I',
-                'generated': datetime.now().isoformat(),
-                'levels': len(levels)
-            },
+            'metadata': self._meta('maps', levels=len(levels)),
             'levels': []
         }
         
         for level_num, level in levels.items():
-            # Summarize tile types
-            tile_counts = {}
-            for row in level.tiles:
-                for tile in row:
-                    tt = tile.tile_type.name
-                    tile_counts[tt] = tile_counts.get(tt, 0) + 1
+            # Summarize tile types (Counter does the tallying in C). Count the enum members
+            # themselves and resolve .name once per distinct type instead of once per tile.
+            type_counts = Counter(tile.tile_type for row in level.tiles for tile in row)
+            tile_counts = {tile_type.name: count for tile_type, count in type_counts.items()}
             
             level_entry = {
                 'level': level_num,
@@ -177,49 +593,27 @@ class JsonExporter:
         
         self._write_json('map_data.json', map_data)
     
+    @_gc_paused()
     def export_all_strings(self, strings_parser) -> None:
         """Export all game strings."""
         all_blocks = strings_parser.get_all_blocks()
         
         strings_data = {
-            'metadata': {
-                'type': 'strings',
-                'game': 'Ultima Underworld I',
-                'generated': datetime.now().isoformat(),
-                'block_count': len(all_blocks)
-            },
-            'blocks': {}
+            'metadata': self._meta('strings', block_count=len(all_blocks)),
         }
         
-        block_names = {
-            1: 'ui',
-            2: 'chargen_mantras',
-            3: 'scrolls_books',
-            4: 'object_names',
-            5: 'object_look',
-            6: 'spell_names',
-            7: 'npc_names',
-            8: 'wall_text',
-            9: 'trap_messages',
-            10: 'wall_floor_desc',
-            24: 'debug'
-        }
-        
-        for block_num, strings in all_blocks.items():
-            block_name = block_names.get(block_num, f'block_{block_num}')
-            if block_num >= 0x0C00:
-                block_name = f'conversation_{block_num:04X}'
-            elif block_num >= 0x0E00:
-                block_name = f'conv_strings_{block_num:04X}'
-            
-            strings_data['blocks'][str(block_num)] = {
-                'name': block_name,
-                'count': len(strings),
-                'strings': strings
-            }
+        def block_entries():
+            for block_num, strings in all_blocks.items():
+                yield str(block_num), {
+                    'name': _name_for_block(block_num),
+                    'count': len(strings),
+                    'strings': strings
+                }
         
-        self._write_json('strings.json', strings_data)
+        # Blocks are encoded one at a time rather than as one document-sized buffer
+        self._write_json_streamed('strings.json', strings_data, 'blocks', block_entries())
 
+    @_gc_paused()
     def export_web_map_data(self, placed_items: List, npcs: List, npc_names: Dict, 
                             item_types: Dict = None, levels: Dict = None,
                             strings_parser = None, secrets: List = None,
@@ -248,7 +642,13 @@ class JsonExporter:
             tmobj_image_paths: Dict mapping tmobj_sprite_idx -> image_path for TMOBJ images
             wall_image_paths: Dict mapping wall_texture_idx -> image_path for wall textures
         """
-        from ..constants import SPELL_DESCRIPTIONS
+        from ..constants import (
+            SPELL_DESCRIPTIONS, get_special_wand_info, is_quest_book, is_special_tmap, is_door,
+            FOOD_NUTRITION, FOOD_IDS, DRINK_INTOXICATION,
+        )
+        from ..constants.npcs import NPC_TYPE_BY_OBJECT_ID
+        from ..constants.switches import describe_switch_effect
+        from ..constants.traps import is_trap, is_trigger, describe_trap_effect, is_level_transition_teleport
         import struct
         
         # Get string blocks for rich descriptions
@@ -258,6 +658,9 @@ class JsonExporter:
         spell_names_list = strings_parser.get_block(6) or [] if strings_parser else []
         block8 = strings_parser.get_block(8) or [] if strings_parser else []  # Wall/sign text (for writing/gravestones)
         block9 = strings_parser.get_block(9) or [] if strings_parser else []  # Trap messages
+        len_block3 = len(block3)
+        len_block5 = len(block5)
+        len_block8 = len(block8)
         
         # Load texture mapping tables for each level (needed for tmap object wall textures)
         # The texture mapping maps owner field values to actual W64.TR indices
@@ -311,11 +714,18 @@ class JsonExporter:
             # If texture mapping loading fails, tmap objects will fall back to OBJECTS.GR
             pass
         
-        # Build spell names dict for lookups
-        spell_names = {}
-        for i, name in enumerate(spell_names_list):
-            if name and name.strip():
-                spell_names[i] = name.strip()
+        # Spell names indexed directly by spell id ("" for blank entries)
+        spell_names = tuple(name.strip() if name else "" for name in spell_names_list)
+        num_spell_names = len(spell_names)
+        
+        def resolve_spell(*spell_indices: int) -> str:
+            """Get the spell name at the first candidate index that has one ("" if none)."""
+            for spell_idx in spell_indices:
+                if 0 <= spell_idx < num_spell_names:
+                    spell = spell_names[spell_idx]
+                    if spell:
+                        return spell
+            return ""
 
         def get_wand_spell_and_charges(
             level_num: int,
@@ -341,16 +751,16 @@ class JsonExporter:
                 return spell_name, charges
 
             spell_obj = level.objects[special_link]
-            if getattr(spell_obj, "item_id", None) != 0x120:
+            if spell_obj.item_id != 0x120:
                 return spell_name, charges
 
-            charges = getattr(spell_obj, "quality", wand_quality)
+            charges = spell_obj.quality
 
             # Spell id is stored separately from charges. Try known encodings.
-            v = getattr(spell_obj, "quantity_or_link", 0)
+            v = spell_obj.quantity_or_link
             candidates: list[int] = []
 
-            if getattr(spell_obj, "is_quantity", False):
+            if spell_obj.is_quantity:
                 # Common encoding: quantity_or_link = 256 + spell_index
                 if v >= 256:
                     candidates.append(v - 256)
@@ -360,556 +770,477 @@ class JsonExporter:
                 # Rare/unknown: try interpreting as direct index (with simple offsets)
                 candidates.extend([v, v - 256, v + 256])
 
-            max_idx = len(spell_names_list)
-            for cand in candidates:
-                if 0 <= cand < max_idx:
-                    name = spell_names.get(cand, "")
-                    if name:
-                        spell_name = name
-                        break
+            spell_name = resolve_spell(*candidates)
 
             return spell_name, charges
         
-        def get_item_description(item, object_id: int, is_enchanted: bool, is_quantity: bool, 
-                                 quantity: int, quality: int, owner: int,
-                                 special_link: int, level_num: int) -> str:
-            """Get item description based on type (books, scrolls, keys, wands, etc.).
-            
-            Note: Spell scrolls (enchanted books/scrolls) don't have readable text -
-            they cast spells instead. Only non-enchanted books/scrolls have readable content.
-            """
-            link_value = quantity if is_quantity else special_link
-            
-            # Keys (0x100-0x10E)
-            if 0x100 <= object_id <= 0x10E:
-                if owner > 0:
-                    desc_idx = 100 + owner
-                    if desc_idx < len(block5) and block5[desc_idx]:
-                        return block5[desc_idx]
-                if object_id == 0x101:
-                    return "A lockpick"
-                return ""
-            
-            # Books (0x130-0x137) - only readable if NOT enchanted (spell scrolls don't have text)
-            if 0x130 <= object_id <= 0x137:
-                # Spell scrolls (enchanted) cast spells, they don't have readable text
-                if is_enchanted:
-                    return ""
-                if is_quantity and link_value >= 512:
-                    text_idx = link_value - 512
-                    if text_idx < len(block3) and block3[text_idx]:
-                        return block3[text_idx].strip()
-                return ""
-            
-            # Scrolls (0x138-0x13F, except 0x13B map) - only readable if NOT enchanted
-            if 0x138 <= object_id <= 0x13F and object_id != 0x13B:
-                # Spell scrolls (enchanted) cast spells, they don't have readable text
-                if is_enchanted:
-                    return ""
-                if is_quantity and link_value >= 512:
-                    text_idx = link_value - 512
-                    if text_idx < len(block3) and block3[text_idx]:
-                        return block3[text_idx].strip()
-                return ""
-            
-            # Writing (0x166) and Gravestone (0x165) - use quantity or special_link offset by 512 as index into block 8 (wall/sign text)
-            # Writing/gravestones can have is_quantity=True with quantity >= 512, or is_quantity=False with special_link >= 512
-            if object_id in (0x165, 0x166):
-                if link_value > 0 and link_value >= 512:
-                    # Offset by 512 to get actual index into block 8 (wall/sign text, not block 3)
-                    text_idx = link_value - 512
-                    if text_idx >= 0 and text_idx < len(block8):
-                        desc = block8[text_idx]
-                        if desc and desc.strip():
-                            return desc.strip()
+        def describe_key(item, object_id: int, is_enchanted: bool, is_quantity: bool, quantity: int, quality: int,
+                         owner: int, special_link: int, level_num: int, link_value: int) -> str:
+            """Keys (0x100-0x10E)."""
+            if owner > 0:
+                desc_idx = 100 + owner
+                desc = block5[desc_idx] if desc_idx < len_block5 else ""
+                if desc:
+                    return desc
+            if object_id == 0x101:
+                return "A lockpick"
+            return ""
+        
+        def describe_readable(item, object_id: int, is_enchanted: bool, is_quantity: bool, quantity: int, quality: int,
+                              owner: int, special_link: int, level_num: int, link_value: int) -> str:
+            """Books (0x130-0x137) and scrolls (0x138-0x13F, except 0x13B map) - only readable if NOT enchanted."""
+            # Spell scrolls (enchanted) cast spells, they don't have readable text
+            if is_enchanted:
                 return ""
+            if is_quantity and link_value >= 512:
+                text_idx = link_value - 512
+                text = block3[text_idx] if text_idx < len_block3 else ""
+                if text:
+                    return text.strip()
+            return ""
+        
+        def describe_writing(item, object_id: int, is_enchanted: bool, is_quantity: bool, quantity: int, quality: int,
+                             owner: int, special_link: int, level_num: int, link_value: int) -> str:
+            """Writing (0x166) and Gravestone (0x165) - text from block 8 (wall/sign text).
             
-            # Wands (0x98-0x9B)
-            if 0x98 <= object_id <= 0x9B:
-                # Check for special wands with unique spells or incorrect mappings first
-                from ..constants import get_special_wand_info
-                tile_x = getattr(item, 'tile_x', 0)
-                tile_y = getattr(item, 'tile_y', 0)
-                special_wand = get_special_wand_info(level_num, tile_x, tile_y)
-                if special_wand:
-                    _, charges = get_wand_spell_and_charges(level_num, is_quantity, quality, special_link)
-                    return f"{special_wand['name']} ({charges} charges)"
-                
-                if levels and not is_quantity:
-                    spell, _ = get_wand_spell_and_charges(level_num, is_quantity, quality, special_link)
-                    if spell:
-                        return f"Wand of {spell}"
-                # If spell can't be resolved, at least show charges.
+            Uses quantity or special_link offset by 512 as the index: writing/gravestones can have
+            is_quantity=True with quantity >= 512, or is_quantity=False with special_link >= 512.
+            """
+            if link_value >= 512:
+                # Offset by 512 to get actual index into block 8 (wall/sign text, not block 3)
+                text_idx = link_value - 512
+                if text_idx < len_block8:
+                    desc = block8[text_idx].strip()
+                    if desc:
+                        return desc
+            return ""
+        
+        def describe_wand(item, object_id: int, is_enchanted: bool, is_quantity: bool, quantity: int, quality: int,
+                          owner: int, special_link: int, level_num: int, link_value: int) -> str:
+            """Wands (0x98-0x9B)."""
+            # Check for special wands with unique spells or incorrect mappings first
+            tile_x = item.tile_x
+            tile_y = item.tile_y
+            special_wand = get_special_wand_info(level_num, tile_x, tile_y)
+            if special_wand:
                 _, charges = get_wand_spell_and_charges(level_num, is_quantity, quality, special_link)
-                return f"Wand ({charges} charges)"
-            
-            # Map (0x13B)
-            if object_id == 0x13B:
-                return "Shows explored areas"
-            
-            # Potions (0xBB = red mana, 0xBC = green heal)
-            if object_id in (0xBB, 0xBC):
-                if is_quantity and link_value >= 512:
-                    raw_idx = link_value - 512
-                    spell_256 = spell_names.get(raw_idx + 256, "")
-                    if spell_256:
-                        return f"Potion of {spell_256}"
-                    spell_raw = spell_names.get(raw_idx, "")
-                    if spell_raw:
-                        return f"Potion of {spell_raw}"
-                    return f"Potion (effect #{raw_idx})"
-                if object_id == 0xBB:
-                    return "Restores Mana"
-                else:
-                    return "Heals Wounds"
-            
-            # Coins
-            if object_id == 0xA0:
-                if is_quantity:
-                    return f"{quantity} gold pieces"
-                return "Gold coin"
-            
-            # Arrows/bolts - show stack count
-            if object_id in (0x10, 0x11, 0x12):
-                if is_quantity and quantity > 1:
-                    return f"Stack of {quantity}"
-                return ""
+                return f"{special_wand['name']} ({charges} charges)"
             
-            # Switches (0x170-0x17F) and lever 0x161 - follow link chain to describe effect
-            if (0x170 <= object_id <= 0x17F) or object_id == 0x161:
-                from ..constants.switches import describe_switch_effect
-                from ..constants.traps import is_trap, is_trigger
-                
-                # Get switch coordinates for finding nearby doors
-                switch_x = getattr(item, 'tile_x', 0)
-                switch_y = getattr(item, 'tile_y', 0)
-                
-                # Switches link to triggers which link to traps
-                # Chain: Switch -> Trigger -> Trap -> Effect
-                if special_link > 0 and levels:
-                    level = levels.get(level_num)
-                    if level and special_link in level.objects:
-                        target = level.objects[special_link]
-                        
-                        # Check if switch links directly to a trigger
-                        if is_trigger(target.item_id):
-                            # Follow trigger to its trap
-                            trap_link = target.quantity_or_link
-                            if trap_link > 0 and trap_link in level.objects:
-                                trap_obj = level.objects[trap_link]
-                                if is_trap(trap_obj.item_id):
-                                    # Get target object for create_object_trap
-                                    target_obj = None
-                                    target_link = trap_obj.quantity_or_link if not trap_obj.is_quantity else 0
-                                    if target_link > 0 and target_link in level.objects:
-                                        target_obj = level.objects[target_link]
-                                    
-                                    return describe_switch_effect(
-                                        trap_obj.item_id, trap_obj.quality, trap_obj.owner,
-                                        trap_obj.tile_x, trap_obj.tile_y, level_num,
-                                        block4, target_obj,
-                                        switch_x, switch_y, level.objects,
-                                        trap_messages=block9,
-                                        spell_names=spell_names_list
-                                    )
-                            return ""
+            if levels and not is_quantity:
+                spell, _ = get_wand_spell_and_charges(level_num, is_quantity, quality, special_link)
+                if spell:
+                    return f"Wand of {spell}"
+            # If spell can't be resolved, at least show charges.
+            _, charges = get_wand_spell_and_charges(level_num, is_quantity, quality, special_link)
+            return f"Wand ({charges} charges)"
+        
+        def describe_map(item, object_id: int, is_enchanted: bool, is_quantity: bool, quantity: int, quality: int,
+                         owner: int, special_link: int, level_num: int, link_value: int) -> str:
+            """Map (0x13B)."""
+            return "Shows explored areas"
+        
+        def describe_potion(item, object_id: int, is_enchanted: bool, is_quantity: bool, quantity: int, quality: int,
+                            owner: int, special_link: int, level_num: int, link_value: int) -> str:
+            """Potions (0xBB = red mana, 0xBC = green heal)."""
+            if is_quantity and link_value >= 512:
+                raw_idx = link_value - 512
+                spell = resolve_spell(raw_idx + 256, raw_idx)
+                if spell:
+                    return f"Potion of {spell}"
+                return f"Potion (effect #{raw_idx})"
+            if object_id == 0xBB:
+                return "Restores Mana"
+            else:
+                return "Heals Wounds"
+        
+        def describe_coin(item, object_id: int, is_enchanted: bool, is_quantity: bool, quantity: int, quality: int,
+                          owner: int, special_link: int, level_num: int, link_value: int) -> str:
+            """Coins."""
+            if is_quantity:
+                return f"{quantity} gold pieces"
+            return "Gold coin"
+        
+        def describe_ammo(item, object_id: int, is_enchanted: bool, is_quantity: bool, quantity: int, quality: int,
+                          owner: int, special_link: int, level_num: int, link_value: int) -> str:
+            """Arrows/bolts - show stack count."""
+            if is_quantity and quantity > 1:
+                return f"Stack of {quantity}"
+            return ""
+        
+        def describe_switch(item, object_id: int, is_enchanted: bool, is_quantity: bool, quantity: int, quality: int,
+                            owner: int, special_link: int, level_num: int, link_value: int) -> str:
+            """Switches (0x170-0x17F) and lever 0x161 - follow link chain to describe effect."""
+            # Get switch coordinates for finding nearby doors
+            switch_x = item.tile_x
+            switch_y = item.tile_y
+            
+            # Switches link to triggers which link to traps
+            # Chain: Switch -> Trigger -> Trap -> Effect
+            if special_link > 0 and levels:
+                level = levels.get(level_num)
+                if level and special_link in level.objects:
+                    target = level.objects[special_link]
+                    
+                    # Check if switch links directly to a trigger
+                    if is_trigger(target.item_id):
+                        # Follow trigger to its trap
+                        trap_link = target.quantity_or_link
+                        if trap_link > 0 and trap_link in level.objects:
+                            trap_obj = level.objects[trap_link]
+                            if is_trap(trap_obj.item_id):
+                                # Get target object for create_object_trap
+                                target_obj = None
+                                target_link = trap_obj.quantity_or_link if not trap_obj.is_quantity else 0
+                                if target_link > 0 and target_link in level.objects:
+                                    target_obj = level.objects[target_link]
+                                
+                                return describe_switch_effect(
+                                    trap_obj.item_id, trap_obj.quality, trap_obj.owner,
+                                    trap_obj.tile_x, trap_obj.tile_y, level_num,
+                                    block4, target_obj,
+                                    switch_x, switch_y, level.objects,
+                                    trap_messages=block9,
+                                    spell_names=spell_names_list
+                                )
+                        return ""
+                    
+                    # Check if switch links directly to a trap
+                    elif is_trap(target.item_id):
+                        # Get target object for delete_object_trap or create_object_trap
+                        target_obj = None
+                        target_link = target.quantity_or_link if not target.is_quantity else 0
+                        if target_link > 0 and target_link in level.objects:
+                            target_obj = level.objects[target_link]
                         
-                        # Check if switch links directly to a trap
-                        elif is_trap(target.item_id):
-                            # Get target object for delete_object_trap or create_object_trap
-                            target_obj = None
-                            target_link = target.quantity_or_link if not target.is_quantity else 0
-                            if target_link > 0 and target_link in level.objects:
-                                target_obj = level.objects[target_link]
-                            
-                            return describe_switch_effect(
-                                target.item_id, target.quality, target.owner,
-                                target.tile_x, target.tile_y, level_num,
-                                block4, target_obj,
-                                switch_x, switch_y, level.objects,
-                                trap_messages=block9,
-                                spell_names=spell_names_list
-                            )
-                
-                return ""
-            
-            # Traps (0x180-0x19F) - use detailed descriptions
-            if 0x180 <= object_id <= 0x19F:
-                from ..constants.traps import describe_trap_effect
-                # Get level objects for following links
-                level_objs = None
-                if levels:
-                    level = levels.get(level_num)
-                    if level:
-                        level_objs = level.objects
-                
-                return describe_trap_effect(
-                    object_id, quality, owner, 
-                    getattr(item, 'z_pos', 0) if hasattr(item, 'z_pos') else item.to_dict().get('position', {}).get('z', 0),
-                    getattr(item, 'tile_x', 0), getattr(item, 'tile_y', 0),
-                    level_num,
-                    is_quantity=is_quantity,
-                    quantity_or_link=special_link if not is_quantity else quantity,
-                    level_objects=level_objs,
-                    object_names=block4,
-                    trap_messages=block9,
-                    spell_names=spell_names_list
-                )
-            
-            # Triggers (0x1A0-0x1BF) - show what trap they link to
-            if 0x1A0 <= object_id <= 0x1BF:
-                from ..constants.traps import get_trigger_name, describe_trap_effect, is_trap
-                
-                # Check if trigger links to a trap
-                # Note: For triggers, special_link is always the trap link
-                # (is_quantity flag doesn't apply to triggers the same way)
-                if special_link > 0 and levels:
-                    level = levels.get(level_num)
-                    if level and special_link in level.objects:
-                        target = level.objects[special_link]
-                        if is_trap(target.item_id):
-                            # For door traps at (0,0), use trigger coordinates for proximity search
-                            trigger_x = getattr(item, 'tile_x', 0)
-                            trigger_y = getattr(item, 'tile_y', 0)
-                            use_x = target.tile_x if target.tile_x > 0 else trigger_x
-                            use_y = target.tile_y if target.tile_y > 0 else trigger_y
-                            effect = describe_trap_effect(
-                                target.item_id, target.quality, target.owner,
-                                target.z_pos, use_x, use_y,
-                                level_num,
-                                is_quantity=target.is_quantity,
-                                quantity_or_link=target.quantity_or_link,
-                                level_objects=level.objects,
-                                object_names=block4,
-                                trap_messages=block9,
-                                spell_names=spell_names_list
-                            )
-                            # Return just the effect description without trap type prefix
-                            return effect
-                
-                # For move_trigger with no linked trap, show destination
-                if object_id == 0x1A0:
-                    return f"Move to ({quality}, {owner})"
-                return ""
+                        return describe_switch_effect(
+                            target.item_id, target.quality, target.owner,
+                            target.tile_x, target.tile_y, level_num,
+                            block4, target_obj,
+                            switch_x, switch_y, level.objects,
+                            trap_messages=block9,
+                            spell_names=spell_names_list
+                        )
             
             return ""
         
-        def get_item_effect(item, object_id: int, is_enchanted: bool, is_quantity: bool,
-                           quantity: int, quality: int, special_link: int, level_num: int) -> str:
-            """Get enchantment/effect description for an item."""
-            link_value = quantity if is_quantity else special_link
+        def describe_trap(item, object_id: int, is_enchanted: bool, is_quantity: bool, quantity: int, quality: int,
+                          owner: int, special_link: int, level_num: int, link_value: int) -> str:
+            """Traps (0x180-0x19F) - use detailed descriptions."""
+            # Get level objects for following links
+            level_objs = None
+            if levels:
+                level = levels.get(level_num)
+                if level:
+                    level_objs = level.objects
+            
+            return describe_trap_effect(
+                object_id, quality, owner, 
+                item.z_pos,
+                item.tile_x, item.tile_y,
+                level_num,
+                is_quantity=is_quantity,
+                quantity_or_link=special_link if not is_quantity else quantity,
+                level_objects=level_objs,
+                object_names=block4,
+                trap_messages=block9,
+                spell_names=spell_names_list
+            )
+        
+        def describe_trigger(item, object_id: int, is_enchanted: bool, is_quantity: bool, quantity: int, quality: int,
+                             owner: int, special_link: int, level_num: int, link_value: int) -> str:
+            """Triggers (0x1A0-0x1BF) - show what trap they link to."""
+            # Check if trigger links to a trap
+            # Note: For triggers, special_link is always the trap link
+            # (is_quantity flag doesn't apply to triggers the same way)
+            if special_link > 0 and levels:
+                level = levels.get(level_num)
+                if level and special_link in level.objects:
+                    target = level.objects[special_link]
+                    if is_trap(target.item_id):
+                        # For door traps at (0,0), use trigger coordinates for proximity search
+                        trigger_x = item.tile_x
+                        trigger_y = item.tile_y
+                        use_x = target.tile_x if target.tile_x > 0 else trigger_x
+                        use_y = target.tile_y if target.tile_y > 0 else trigger_y
+                        effect = describe_trap_effect(
+                            target.item_id, target.quality, target.owner,
+                            target.z_pos, use_x, use_y,
+                            level_num,
+                            is_quantity=target.is_quantity,
+                            quantity_or_link=target.quantity_or_link,
+                            level_objects=level.objects,
+                            object_names=block4,
+                            trap_messages=block9,
+                            spell_names=spell_names_list
+                        )
+                        # Return just the effect description without trap type prefix
+                        return effect
             
-            def format_spell(spell_name: str) -> str:
-                """Format spell name with description if available."""
-                if not spell_name:
-                    return ""
-                desc = SPELL_DESCRIPTIONS.get(spell_name, "")
-                if desc:
-                    return f"{spell_name} ({desc})"
-                return spell_name
-            
-            # Wands - show charges and spell
-            if 0x98 <= object_id <= 0x9B:
-                # Check for special wands with unique spells or incorrect mappings first
-                from ..constants import get_special_wand_info
-                tile_x = getattr(item, 'tile_x', 0)
-                tile_y = getattr(item, 'tile_y', 0)
-                special_wand = get_special_wand_info(level_num, tile_x, tile_y)
-                if special_wand:
-                    _, charges = get_wand_spell_and_charges(level_num, is_quantity, quality, special_link)
-                    return f"{special_wand['name']} ({charges} charges)"
-                
-                spell, charges = get_wand_spell_and_charges(level_num, is_quantity, quality, special_link)
-                if spell:
-                    return f"{format_spell(spell)} ({charges} charges)"
-                return f"Unknown spell ({charges} charges)" if charges > 0 else "Empty"
+            # For move_trigger with no linked trap, show destination
+            if object_id == 0x1A0:
+                return f"Move to ({quality}, {owner})"
+            return ""
+        
+        # Object ID -> description handler, built once so each item does a single lookup
+        # instead of walking the chain of range checks
+        description_handlers = {}
+        for handler, object_ids in (
+            (describe_key, range(0x100, 0x10F)),
+            (describe_readable, (i for i in range(0x130, 0x140) if i != 0x13B)),
+            (describe_writing, (0x165, 0x166)),
+            (describe_wand, range(0x98, 0x9C)),
+            (describe_map, (0x13B,)),
+            (describe_potion, (0xBB, 0xBC)),
+            (describe_coin, (0xA0,)),
+            (describe_ammo, (0x10, 0x11, 0x12)),
+            (describe_switch, (*range(0x170, 0x180), 0x161)),
+            (describe_trap, range(0x180, 0x1A0)),
+            (describe_trigger, range(0x1A0, 0x1C0)),
+        ):
+            for oid in object_ids:
+                description_handlers[oid] = handler
+        
+        def build_item_description(item, object_id: int, is_enchanted: bool, is_quantity: bool, 
+                                   quantity: int, quality: int, owner: int,
+                                   special_link: int, level_num: int) -> str:
+            """Get item description based on type (books, scrolls, keys, wands, etc.).
             
-            # Keys
-            if 0x100 <= object_id <= 0x10E:
-                if hasattr(item, 'owner') and item.owner > 0:
-                    return f"Opens lock #{item.owner}"
+            Note: Spell scrolls (enchanted books/scrolls) don't have readable text -
+            they cast spells instead. Only non-enchanted books/scrolls have readable content.
+            """
+            handler = description_handlers.get(object_id)
+            if handler is None:
                 return ""
-            
-            # Books/Scrolls - text index reference or spell name for spell scrolls
-            if 0x130 <= object_id <= 0x13F and object_id != 0x13B:
-                if is_quantity and link_value >= 512:
-                    text_idx = link_value - 512
-                    # For enchanted scrolls (spell scrolls), show the spell name
-                    if is_enchanted:
-                        # Try multiple offsets: +256 (common), +144 (for some spells like Hallucination), then direct
-                        spell_256 = spell_names.get(text_idx + 256, "")
-                        if spell_256:
-                            return f"Spell: {format_spell(spell_256)}"
-                        spell_144 = spell_names.get(text_idx + 144, "")
-                        if spell_144:
-                            return f"Spell: {format_spell(spell_144)}"
-                        # Try raw index
-                        spell_raw = spell_names.get(text_idx, "")
-                        if spell_raw:
-                            return f"Spell: {format_spell(spell_raw)}"
-                        return f"Spell #{text_idx}"
-                    # Regular readable scrolls/books
-                    return f"Text #{text_idx}"
+            link_value = quantity if is_quantity else special_link
+            return handler(item, object_id, is_enchanted, is_quantity, quantity, quality,
+                           owner, special_link, level_num, link_value)
+        
+        # Formatted spell text by spell name - the pool of names is small and fixed
+        formatted_spell_cache = {}
+        
+        def format_spell(spell_name: str) -> str:
+            """Format spell name with description if available."""
+            if not spell_name:
                 return ""
+            formatted = formatted_spell_cache.get(spell_name)
+            if formatted is None:
+                desc = SPELL_DESCRIPTIONS.get(spell_name, "")
+                formatted = formatted_spell_cache[spell_name] = f"{spell_name} ({desc})" if desc else spell_name
+            return formatted
+        
+        def effect_wand(item, object_id: int, is_enchanted: bool, is_quantity: bool, quantity: int, quality: int,
+                        special_link: int, level_num: int, link_value: int) -> str:
+            """Wands - show charges and spell."""
+            # Check for special wands with unique spells or incorrect mappings first
+            tile_x = item.tile_x
+            tile_y = item.tile_y
+            special_wand = get_special_wand_info(level_num, tile_x, tile_y)
+            if special_wand:
+                _, charges = get_wand_spell_and_charges(level_num, is_quantity, quality, special_link)
+                return f"{special_wand['name']} ({charges} charges)"
             
-            # Potions - show spell effect
-            if object_id in (0xBB, 0xBC):
-                if is_quantity and link_value >= 512:
-                    raw_idx = link_value - 512
-                    spell_256 = spell_names.get(raw_idx + 256, "")
-                    if spell_256:
-                        return format_spell(spell_256)
-                    spell_raw = spell_names.get(raw_idx, "")
-                    if spell_raw:
-                        return format_spell(spell_raw)
-                    return f"Effect #{raw_idx}"
-                if object_id == 0xBB:
-                    return "Restores Mana"
-                else:
-                    return "Heals Wounds"
-            
-            # For sceptres, check for enchantment even if is_enchanted flag is not set
-            # Sceptres encode enchantments with an offset: ench_property - offset = spell_index
-            # Try -73 first (works for some sceptres like Ally), then fall back to -76
-            # Example: 760 - 512 = 248, then 248 - 76 = 172 ("Restore Mana")
-            if object_id == 0x0AA:
-                # Try special_link first (standard enchantment encoding)
-                link = special_link
-                if link >= 512:
-                    ench_property = link - 512
-                    # Try -73 offset first
-                    spell_idx = ench_property - 73
-                    spell = spell_names.get(spell_idx, "")
-                    if spell:
-                        return format_spell(spell)
-                    # Fall back to -76 offset
-                    spell_idx = ench_property - 76
-                    spell = spell_names.get(spell_idx, "")
+            spell, charges = get_wand_spell_and_charges(level_num, is_quantity, quality, special_link)
+            if spell:
+                return f"{format_spell(spell)} ({charges} charges)"
+            return f"Unknown spell ({charges} charges)" if charges > 0 else "Empty"
+        
+        def effect_key(item, object_id: int, is_enchanted: bool, is_quantity: bool, quantity: int, quality: int,
+                       special_link: int, level_num: int, link_value: int) -> str:
+            """Keys - show which lock they open."""
+            if item.owner > 0:
+                return f"Opens lock #{item.owner}"
+            return ""
+        
+        def effect_readable(item, object_id: int, is_enchanted: bool, is_quantity: bool, quantity: int, quality: int,
+                            special_link: int, level_num: int, link_value: int) -> str:
+            """Books/Scrolls - text index reference or spell name for spell scrolls."""
+            if is_quantity and link_value >= 512:
+                text_idx = link_value - 512
+                # For enchanted scrolls (spell scrolls), show the spell name
+                if is_enchanted:
+                    # Try multiple offsets: +256 (common), +144 (for some spells like Hallucination), then direct
+                    spell = resolve_spell(text_idx + 256, text_idx + 144, text_idx)
                     if spell:
-                        return format_spell(spell)
-                    return f"Unknown enchantment ({ench_property})"
-                # Try quantity (may be used for sceptres even when is_quantity is False)
-                link = quantity
+                        return f"Spell: {format_spell(spell)}"
+                    return f"Spell #{text_idx}"
+                # Regular readable scrolls/books
+                return f"Text #{text_idx}"
+            return ""
+        
+        def effect_potion(item, object_id: int, is_enchanted: bool, is_quantity: bool, quantity: int, quality: int,
+                          special_link: int, level_num: int, link_value: int) -> str:
+            """Potions - show spell effect."""
+            if is_quantity and link_value >= 512:
+                raw_idx = link_value - 512
+                spell = resolve_spell(raw_idx + 256, raw_idx)
+                if spell:
+                    return format_spell(spell)
+                return f"Effect #{raw_idx}"
+            if object_id == 0xBB:
+                return "Restores Mana"
+            else:
+                return "Heals Wounds"
+        
+        def effect_sceptre(item, object_id: int, is_enchanted: bool, is_quantity: bool, quantity: int, quality: int,
+                           special_link: int, level_num: int, link_value: int) -> str:
+            """Sceptres - check for enchantment even if is_enchanted flag is not set.
+            
+            Sceptres encode enchantments with an offset: ench_property - offset = spell_index.
+            Try -73 first (works for some sceptres like Ally), then fall back to -76.
+            Example: 760 - 512 = 248, then 248 - 76 = 172 ("Restore Mana")
+            """
+            # Try special_link first (standard enchantment encoding), then quantity
+            # (may be used for sceptres even when is_quantity is False)
+            for link in (special_link, quantity):
                 if link >= 512:
                     ench_property = link - 512
-                    # Try -73 offset first
-                    spell_idx = ench_property - 73
-                    spell = spell_names.get(spell_idx, "")
-                    if spell:
-                        return format_spell(spell)
-                    # Fall back to -76 offset
-                    spell_idx = ench_property - 76
-                    spell = spell_names.get(spell_idx, "")
+                    # Try -73 offset first, then fall back to -76
+                    spell = resolve_spell(ench_property - 73, ench_property - 76)
                     if spell:
                         return format_spell(spell)
                     return f"Unknown enchantment ({ench_property})"
-                return ""
-            
-            # For treasure items, check for enchantment even if is_enchanted flag is not set
+            return ""
+        
+        # Enchantment effect text per item class, indexed by ench_property (link - 512).
+        # Links are 10-bit, so every reachable value (0-511) is resolved once up front
+        # instead of walking the band checks and spell lookups for each item.
+        def equipment_ench_text(ench_property: int, band_spell_base: int, label_a: str, label_b: str,
+                                low_spell_offsets: tuple, low_fallback: bool) -> str:
+            """Weapon/armor enchantment text; the two differ only in these parameters.
+            
+            Properties 192-199 and 200-207 are the +1..+8 bands (label_a, label_b) whose spells
+            sit contiguously from band_spell_base. Properties below 64 try each low spell offset.
+            """
+            if 192 <= ench_property <= 207:
+                spell = resolve_spell(band_spell_base + ench_property - 192)
+                if ench_property <= 199:
+                    return format_spell(spell) or f"{label_a} +{ench_property - 191}"
+                return format_spell(spell) or f"{label_b} +{ench_property - 199}"
+            if ench_property < 64:
+                spell = resolve_spell(*(offset + ench_property for offset in low_spell_offsets))
+                return format_spell(spell) or (f"Enchantment #{ench_property}" if low_fallback else "")
+            return format_spell(resolve_spell(ench_property)) or f"Enchantment #{ench_property}"
+        
+        def weapon_ench_text(ench_property: int) -> str:
+            # Low properties only use 256+offset, with no numbered fallback
+            return equipment_ench_text(ench_property, 448, "Accuracy", "Damage", (256,), False)
+        
+        def armor_ench_text(ench_property: int) -> str:
+            # Try direct index first (some spells are at direct index), then 256+offset
+            return equipment_ench_text(ench_property, 464, "Protection", "Toughness", (0, 256), True)
+        
+        def ring_ench_text(ench_property: int) -> str:
+            return format_spell(resolve_spell(ench_property)) or f"Unknown enchantment ({ench_property})"
+        
+        def treasure_ench_text(ench_property: int) -> str:
             # Treasure items (0xA0-0xAF) use ench_property * 2 as spell index
-            # Exclude sceptres (0xAA) as they have their own special handling
-            if 0xA0 <= object_id <= 0xAF and object_id != 0x0AA and not is_enchanted:
-                link = quantity if is_quantity else special_link
-                if link >= 512:
-                    ench_property = link - 512
-                    spell_idx = ench_property * 2
-                    spell = spell_names.get(spell_idx, "")
-                    if spell:
-                        return format_spell(spell)
-                    return f"Enchantment #{ench_property}"
-            
-            # For armor items, check for enchantment even if is_enchanted flag is not set
-            # Some armor items may have enchantment data in the link field without the flag set
-            if 0x20 <= object_id < 0x40 and not is_enchanted:
-                link = quantity if is_quantity else special_link
-                if link >= 512:
-                    ench_property = link - 512
-                    if 192 <= ench_property <= 199:
-                        spell_idx = 464 + (ench_property - 192)
-                        spell = spell_names.get(spell_idx, "")
-                        if spell:
-                            return format_spell(spell)
-                        return f"Protection +{ench_property - 191}"
-                    elif 200 <= ench_property <= 207:
-                        spell_idx = 472 + (ench_property - 200)
-                        spell = spell_names.get(spell_idx, "")
-                        if spell:
-                            return format_spell(spell)
-                        return f"Toughness +{ench_property - 199}"
-                    elif ench_property < 64:
-                        # Try direct index first (some spells are at direct index)
-                        spell = spell_names.get(ench_property, "")
-                        if spell:
-                            return format_spell(spell)
-                        # Fall back to 256+offset (other spells use this mapping)
-                        spell_idx = 256 + ench_property
-                        spell = spell_names.get(spell_idx, "")
-                        if spell:
-                            return format_spell(spell)
-                        return f"Enchantment #{ench_property}"
-                    else:
-                        spell = spell_names.get(ench_property, "")
-                        if spell:
-                            return format_spell(spell)
-                        return f"Enchantment #{ench_property}"
-            
-            # Check if enchanted (for other item types)
-            if not is_enchanted:
+            return format_spell(resolve_spell(ench_property * 2)) or f"Enchantment #{ench_property}"
+        
+        # (table, text function) per enchantment class, indexed by _ENCH_* constant
+        ench_table_size = 512
+        ench_tables = tuple(
+            (tuple(ench_text(p) for p in range(ench_table_size)), ench_text)
+            for ench_text in (weapon_ench_text, armor_ench_text, ring_ench_text, treasure_ench_text)
+        )
+        
+        def effect_enchantment(item, object_id: int, is_enchanted: bool, is_quantity: bool, quantity: int, quality: int,
+                               special_link: int, level_num: int, link_value: int) -> str:
+            """Enchantment effect for every other item type (weapons, armor, rings, treasure)."""
+            if link_value < 512:
                 return ""
-            
-            link = quantity if is_quantity else special_link
-            if link >= 512:
-                ench_property = link - 512
-            else:
+            ench_class = (_ENCH_CLASS_FLAGGED if is_enchanted else _ENCH_CLASS_UNFLAGGED)[object_id]
+            if ench_class is None:
                 return ""
-            
-            # Weapons enchantments
-            if object_id < 0x20:
-                if 192 <= ench_property <= 199:
-                    spell_idx = 448 + (ench_property - 192)
-                    spell = spell_names.get(spell_idx, "")
-                    if spell:
-                        return format_spell(spell)
-                    return f"Accuracy +{ench_property - 191}"
-                elif 200 <= ench_property <= 207:
-                    spell_idx = 456 + (ench_property - 200)
-                    spell = spell_names.get(spell_idx, "")
-                    if spell:
-                        return format_spell(spell)
-                    return f"Damage +{ench_property - 199}"
-                elif ench_property < 64:
-                    spell_idx = 256 + ench_property
-                    spell = spell_names.get(spell_idx, "")
-                    return format_spell(spell)
-                else:
-                    spell = spell_names.get(ench_property, "")
-                    if spell:
-                        return format_spell(spell)
-                    return f"Enchantment #{ench_property}"
-            
-            # Rings enchantments
-            elif object_id in (0x36, 0x38, 0x39, 0x3A):
-                spell = spell_names.get(ench_property, "")
-                if spell:
-                    return format_spell(spell)
-                return f"Unknown enchantment ({ench_property})"
-            
-            # Armor enchantments
-            elif 0x20 <= object_id < 0x40:
-                if 192 <= ench_property <= 199:
-                    spell_idx = 464 + (ench_property - 192)
-                    spell = spell_names.get(spell_idx, "")
-                    if spell:
-                        return format_spell(spell)
-                    return f"Protection +{ench_property - 191}"
-                elif 200 <= ench_property <= 207:
-                    spell_idx = 472 + (ench_property - 200)
-                    spell = spell_names.get(spell_idx, "")
-                    if spell:
-                        return format_spell(spell)
-                    return f"Toughness +{ench_property - 199}"
-                elif ench_property < 64:
-                    # Try direct index first (some spells are at direct index)
-                    spell = spell_names.get(ench_property, "")
-                    if spell:
-                        return format_spell(spell)
-                    # Fall back to 256+offset (other spells use this mapping)
-                    spell_idx = 256 + ench_property
-                    spell = spell_names.get(spell_idx, "")
-                    if spell:
-                        return format_spell(spell)
-                    return f"Enchantment #{ench_property}"
-                else:
-                    spell = spell_names.get(ench_property, "")
-                    if spell:
-                        return format_spell(spell)
-                    return f"Enchantment #{ench_property}"
-            
-            # Treasure items enchantments
-            # Treasure items (0xA0-0xAF) use ench_property * 2 as spell index
-            # Exclude sceptres (0xAA) as they have their own special handling
-            elif 0xA0 <= object_id <= 0xAF and object_id != 0x0AA:
-                spell_idx = ench_property * 2
-                spell = spell_names.get(spell_idx, "")
-                if spell:
-                    return format_spell(spell)
-                return f"Enchantment #{ench_property}"
-            
-            return ""
+            table, ench_text = ench_tables[ench_class]
+            ench_property = link_value - 512
+            if ench_property < ench_table_size:
+                return table[ench_property]
+            return ench_text(ench_property)
         
-        # Category mapping for objects - maps base/detailed categories to web categories
-        category_map = {
-            # Weapons
-            'melee_weapon': 'weapons',
-            'ranged_weapon': 'weapons',
-            # Armor
-            'armor': 'armor',
-            # Containers - portable (bags, packs) vs static (barrels, chests, urns)
-            'container': 'containers',
-            'storage': 'storage',
-            # Keys
-            'key': 'keys',
-            # Consumables
-            'food': 'food',
-            'potion': 'potions',
-            # Books & Scrolls - combined into single category
-            'scroll': 'books_scrolls',
-            'book': 'books_scrolls',
-            'readable_scroll': 'books_scrolls',
-            'readable_book': 'books_scrolls',
-            'quest_book': 'quest',  # Quest books like Book of Honesty
-            'spell_scroll': 'spell_scrolls',
-            'map': 'books_scrolls',  # Maps shown with books & scrolls
-            # Light sources
-            'light_source': 'light',
-            # Runes (talismans/virtue keys are quest items)
-            'rune': 'runes',
-            'talisman': 'quest',
-            # Wands
-            'wand': 'wands',
-            'broken_wand': 'misc',  # Broken wands can't cast spells, not magical
-            'spell': 'misc',  # Internal spell objects
-            # Treasure
-            'treasure': 'treasure',
-            # Doors - now split by type
-            'door': 'doors_unlocked',  # Base door category (shouldn't happen, but default to unlocked)
-            'door_locked': 'doors_locked',
-            'door_unlocked': 'doors_unlocked',
-            'secret_door': 'secret_doors',
-            'portcullis': 'doors_unlocked',  # Unlocked portcullis = unlocked door
-            'portcullis_locked': 'doors_locked',
-            'open_portcullis': 'doors_unlocked',  # Open portcullis defaults to unlocked
-            # Traps & Triggers
-            'trap': 'traps',
-            'trigger': 'triggers',
-            # Special objects
-            'special_tmap': 'texture_objects',
-            'switch': 'switches',
-            'furniture': 'furniture',
-            'shrine': 'shrines',
-            'boulder': 'boulders',
-            'decal': 'scenery',
-            'bridge': 'bridges',
-            'gravestones': 'gravestones',
-            'writings': 'writings',
-            'scenery': 'scenery',
-            'useless_item': 'useless_item',
-            'animation': 'animations',
-            # Quest & misc
-            'quest_item': 'quest',
-            'misc_item': 'misc',
-        }
+        # Object ID -> effect handler for the special item families; everything else
+        # goes through effect_enchantment
+        effect_handlers = {}
+        for handler, object_ids in (
+            (effect_wand, range(0x98, 0x9C)),
+            (effect_key, range(0x100, 0x10F)),
+            (effect_readable, (i for i in range(0x130, 0x140) if i != 0x13B)),
+            (effect_potion, (0xBB, 0xBC)),
+            (effect_sceptre, (0x0AA,)),
+        ):
+            for oid in object_ids:
+                effect_handlers[oid] = handler
+        
+        def build_item_effect(item, object_id: int, is_enchanted: bool, is_quantity: bool,
+                             quantity: int, quality: int, special_link: int, level_num: int) -> str:
+            """Get enchantment/effect description for an item."""
+            handler = effect_handlers.get(object_id, effect_enchantment)
+            link_value = quantity if is_quantity else special_link
+            return handler(item, object_id, is_enchanted, is_quantity, quantity, quality,
+                           special_link, level_num, link_value)
+        
+        # Description/effect results keyed by the item's descriptive fields - stacks of
+        # identical objects (coins, food, potions, books) resolve to the same text
+        item_desc_cache = {}
+        item_effect_cache = {}
+        # Equal texts built for different keys share one string object
+        text_pool = {}
+        
+        def is_position_dependent(object_id: int) -> bool:
+            """Wands, switches, traps and triggers also depend on the object's position."""
+            return ((0x98 <= object_id <= 0x9B) or (0x170 <= object_id <= 0x17F) or
+                    object_id == 0x161 or (0x180 <= object_id <= 0x1BF))
+        
+        def get_item_description(item, object_id: int, is_enchanted: bool, is_quantity: bool, 
+                                 quantity: int, quality: int, owner: int,
+                                 special_link: int, level_num: int) -> str:
+            """Cached wrapper around build_item_description."""
+            if is_position_dependent(object_id):
+                desc = build_item_description(item, object_id, is_enchanted, is_quantity,
+                                              quantity, quality, owner, special_link, level_num)
+                return text_pool.setdefault(desc, desc)
+            key = (object_id, is_enchanted, is_quantity, quantity, quality, owner, special_link, level_num)
+            desc = item_desc_cache.get(key)
+            if desc is None:
+                desc = build_item_description(item, object_id, is_enchanted, is_quantity,
+                                              quantity, quality, owner, special_link, level_num)
+                desc = item_desc_cache[key] = text_pool.setdefault(desc, desc)
+            return desc
+        
+        def get_item_effect(item, object_id: int, is_enchanted: bool, is_quantity: bool,
+                           quantity: int, quality: int, special_link: int, level_num: int) -> str:
+            """Cached wrapper around build_item_effect."""
+            if is_position_dependent(object_id):
+                effect = build_item_effect(item, object_id, is_enchanted, is_quantity,
+                                           quantity, quality, special_link, level_num)
+                return text_pool.setdefault(effect, effect)
+            # Keys describe their lock from item.owner
+            key = (object_id, is_enchanted, is_quantity, quantity, quality, item.owner, special_link, level_num)
+            effect = item_effect_cache.get(key)
+            if effect is None:
+                effect = build_item_effect(item, object_id, is_enchanted, is_quantity,
+                                           quantity, quality, special_link, level_num)
+                effect = item_effect_cache[key] = text_pool.setdefault(effect, effect)
+            return effect
+        
+        # Web category per (detailed_category, object_class) pair - only a few dozen distinct pairs
+        category_resolve_cache = {}
+        
+        def resolve_category(detailed_cat: str, obj_class: str) -> str:
+            """Map an object's categories to a web category (detailed first, then base)."""
+            key = (detailed_cat, obj_class)
+            category = category_resolve_cache.get(key)
+            if category is None:
+                category = _CATEGORY_MAP.get(detailed_cat, _CATEGORY_MAP.get(obj_class, 'misc'))
+                category_resolve_cache[key] = category
+            return category
         
         # Build index lookup for items by level and index
-        items_by_level_index = {}
-        creature_type_by_level_index = {}
+        items_by_level_index = defaultdict(dict)
+        creature_type_by_level_index = defaultdict(dict)
         
         for item in placed_items:
             level = item.level
             index = item.index
-            if level not in items_by_level_index:
-                items_by_level_index[level] = {}
-                creature_type_by_level_index[level] = {}
             items_by_level_index[level][index] = item
             
             # Store creature type name for NPCs
@@ -922,48 +1253,26 @@ class JsonExporter:
                 return item_types[obj_id].name
             return ""
         
+        # Stats depend only on the object type; callers only read the returned dict
+        item_stats_cache = {}
+        
         def get_item_stats(obj_id: int) -> dict:
             """Get item stats (damage, weight, protection, durability, nutrition, intoxication) from item_types if available."""
-            from ..constants import FOOD_NUTRITION, FOOD_IDS
-            from ..constants import DRINK_INTOXICATION, DRINK_NUTRITION, ACTUAL_DRINK_IDS, is_alcoholic
+            stats = item_stats_cache.get(obj_id)
+            if stats is not None:
+                return stats
             
             stats = {}
+            item_stats_cache[obj_id] = stats
             if item_types and obj_id in item_types:
                 item_type = item_types[obj_id]
                 
-                # Add weapon damage and durability for melee weapons (0x00-0x0F)
-                if obj_id <= 0x0F and item_type.properties:
-                    props = item_type.properties
-                    if 'slash_damage' in props:
-                        stats['slash_damage'] = props['slash_damage']
-                    if 'bash_damage' in props:
-                        stats['bash_damage'] = props['bash_damage']
-                    if 'stab_damage' in props:
-                        stats['stab_damage'] = props['stab_damage']
-                    if 'durability' in props:
-                        stats['durability'] = props['durability']
-                
-                # Add durability for ranged weapons (0x10-0x1F)
-                if 0x10 <= obj_id <= 0x1F and item_type.properties:
-                    props = item_type.properties
-                    if 'durability' in props:
-                        stats['durability'] = props['durability']
-                
-                # Add armor stats for armor items (0x20-0x3F)
-                if 0x20 <= obj_id <= 0x3F and item_type.properties:
-                    props = item_type.properties
-                    if 'protection' in props:
-                        stats['protection'] = props['protection']
-                    if 'durability' in props:
-                        stats['durability'] = props['durability']
-                
-                # Add container capacity for containers (0x80-0x8F)
-                if 0x80 <= obj_id <= 0x8F and item_type.properties:
-                    props = item_type.properties
-                    if 'capacity' in props:
-                        stats['capacity'] = props['capacity']
-                    if 'accepts' in props:
-                        stats['accepts'] = props['accepts']
+                # Weapon damage/durability, armor protection/durability, container capacity
+                props = item_type.properties
+                if props:
+                    for key in _STAT_KEYS_BY_ID[obj_id]:
+                        if key in props:
+                            stats[key] = props[key]
                 
                 # Add nutrition for food items (includes ale, water, port)
                 # Note: Wine (0xBF) is a quest item, not in FOOD_IDS
@@ -984,97 +1293,71 @@ class JsonExporter:
             
             return stats
         
-        def is_valid_npc_name(name: str) -> bool:
-            """Check if an NPC name is valid (not a bug artifact)."""
-            if not name:
-                return False
-            invalid_names = {'an excellent deal...', 'excellent deal'}
-            return name.lower() not in invalid_names and not name.lower().startswith('an excellent deal')
+        # Per-type stats already renamed/filtered for web output, merged with dict.update
+        web_item_stats_cache = {}
         
-        def get_faction_name_from_npc_type(npc_type: str) -> str:
-            """Convert NPC type name to human-readable faction name.
-            
-            Args:
-                npc_type: NPC type name from NPC_TYPES (e.g., "green_goblin", "outcast")
+        def get_web_item_stats(obj_id: int) -> tuple:
+            """Get (combat stats, contained-item extra stats) for an object type.
             
-            Returns:
-                Human-readable faction name (e.g., "green goblins", "outcasts")
+            Combat stats hold damage/protection and max_durability (the item type's
+            maximum durability from OBJECTS.DAT). Extra stats hold weight, nutrition
+            and intoxication. Key order matches the web output.
             """
-            from ..constants.npcs import NPC_TYPES
-            
-            # Mapping from NPC type names to faction names
-            faction_map = {
-                'green_goblin': 'green goblins',
-                'goblin': 'gray goblins',
-                'outcast': 'outcasts',
-                'rat': 'rats',
-                'bandit': 'bandits',
-                'troll': 'trolls',
-                'skeleton': 'skeletons',
-                'ghoul': 'ghouls',
-                'ghost': 'ghosts',
-                'zombie': 'zombies',
-                'gazer': 'gazers',
-                'mage': 'mages',
-                'dark_mage': 'dark mages',
-                'headless': 'headless',
-                'imp': 'imps',
-                'mongbat': 'mongbats',
-                'dire_ghost': 'dire ghosts',
-                'shadow_beast': 'shadow beasts',
-                'reaper': 'reapers',
-                'wisp': 'wisps',
-                'fire_elemental': 'fire elementals',
-                'golem_stone': 'stone golems',
-                'golem_metal': 'metal golems',
-                'golem_earth': 'earth golems',
-                'lurker': 'lurkers',
-                'deep_lurker': 'deep lurkers',
-                'slime': 'slimes',
-                'vampire_bat': 'vampire bats',
-                'bat': 'bats',
-                'spider': 'spiders',
-                'giant_spider': 'giant spiders',
-                'dread_spider': 'dread spiders',
-                'acid_slug': 'acid slugs',
-                'flesh_slug': 'flesh slugs',
-                'rotworm': 'rotworms',
-                'bloodworm': 'bloodworms',
-                'lizardman': 'lizardmen',
-                'gray_lizardman': 'gray lizardmen',
-                'red_lizardman': 'red lizardmen',
-                'feral_troll': 'feral trolls',
-                'great_troll': 'great trolls',
-                'dark_ghoul': 'dark ghouls',
-                'mountainman': 'mountainmen',
-                'fighter': 'fighters',
-                'knight': 'knights',
-                'mage_female': 'female mages',
-                'mage_red': 'red mages',
-                'tyball': 'Tyball',
-                'slasher': 'slashers',
-                'dragon': 'dragons',
-                'ethereal_void': 'ethereal voids',
-                'daemon': 'daemons',
-                'undead_warrior': 'undead warriors',
-                'garamon': 'Garamon',
-                'dire_reaper': 'dire reapers',
-                'spectre': 'spectres',
-                'liche': 'liches',
-                'demon': 'demons',
-                'mountain_folk': 'mountain folk',
-                'human_male': 'humans',
-                'human_female': 'humans',
-            }
-            
-            # Return mapped faction name, or convert snake_case to title case as fallback
-            if npc_type in faction_map:
-                return faction_map[npc_type]
-            
-            # Fallback: convert snake_case to title case
-            return npc_type.replace('_', ' ').title()
+            cached = web_item_stats_cache.get(obj_id)
+            if cached is None:
+                stats = get_item_stats(obj_id)
+                combat_stats = {key: stats[key] for key in ('slash_damage', 'bash_damage', 'stab_damage', 'protection')
+                                if key in stats}
+                if 'durability' in stats:
+                    combat_stats['max_durability'] = stats['durability']
+                extra_stats = {key: stats[key] for key in ('weight', 'nutrition', 'intoxication') if key in stats}
+                cached = web_item_stats_cache[obj_id] = (combat_stats, extra_stats)
+            return cached
+        
+        # Placed-object extra stats per (object type, detailed category), merged with dict.update
+        placed_extra_stats_cache = {}
+        
+        def get_placed_extra_stats(obj_id: int, detailed_cat: str) -> dict:
+            """Get weight/capacity/accepts/nutrition/intoxication shown for a placed object."""
+            key = (obj_id, detailed_cat)
+            extra_stats = placed_extra_stats_cache.get(key)
+            if extra_stats is None:
+                item_stats = get_item_stats(obj_id)
+                extra_stats = placed_extra_stats_cache[key] = {}
+                # Don't add weight or capacity for storage items (barrels, chests, urns, cauldrons, tables)
+                # Storage items should not display these stats in the UI
+                is_storage = obj_id in STATIC_CONTAINERS
+                # Don't add weight for scenery items (0xC0-0xDF), campfire (0x12A), or fountain (0x12E)
+                # But allow weight for items categorized as useless_item (like pile of debris)
+                is_scenery = ((0xC0 <= obj_id <= 0xDF) or obj_id in (0x12A, 0x12E)) and detailed_cat != 'useless_item'
+                if 'weight' in item_stats and not is_storage and not is_scenery:
+                    extra_stats['weight'] = item_stats['weight']
+                if 'capacity' in item_stats and not is_storage:
+                    extra_stats['capacity'] = item_stats['capacity']
+                for stat in ('accepts', 'nutrition', 'intoxication'):
+                    if stat in item_stats:
+                        extra_stats[stat] = item_stats[stat]
+            return extra_stats
         
-        def get_owner_name(owner_value: int, object_id: int, level_num: int = None, npcs: List[Any] = None) -> str:
+        # NPC type names indexed by level and by the fields an owner value can refer to,
+        # built once so get_owner_name does dict lookups instead of scanning every NPC.
+        # Lists keep the NPCs' original order.
+        npc_types_on_level = defaultdict(set)
+        npc_types_by_level_slot = defaultdict(list)
+        npc_types_by_level_index = defaultdict(list)
+        npc_types_by_level_owner = defaultdict(list)
+        npc_types_by_slot = defaultdict(list)  # Any level
+        for npc in npcs or ():
+            npc_type = NPC_TYPE_BY_OBJECT_ID[npc.object_id]
+            npc_level = npc.level
+            npc_types_on_level[npc_level].add(npc_type)
+            npc_types_by_level_slot[(npc_level, npc.conversation_slot)].append(npc_type)
+            npc_types_by_level_index[(npc_level, npc.index)].append(npc_type)
+            npc_types_by_level_owner[(npc_level, npc.owner)].append(npc_type)
+            npc_types_by_slot[npc.conversation_slot].append(npc_type)
+        all_npc_types = set().union(*npc_types_on_level.values())
+        
+        def build_owner_name(owner_value: int, object_id: int, level_num: int = None) -> str:
             """Get the faction/group name for an item owner.
             
             The owner field represents a conversation slot. This function finds all NPCs
@@ -1085,13 +1368,10 @@ class JsonExporter:
                 owner_value: The owner field value (0-63), represents conversation slot
                 object_id: The item's object ID (to exclude keys which use owner for lock ID)
                 level_num: The level number (0-8) where the item is located
-                npcs: List of NPCInfo objects to search for matching NPCs
             
             Returns:
                 Faction/group name if found, empty string if no owner or if it's a key
             """
-            from ..constants.npcs import NPC_TYPES, get_npc_type_name
-            
             # Keys use owner field for lock ID, not NPC ownership
             if 0x100 <= object_id <= 0x10E:
                 return ""
@@ -1101,54 +1381,27 @@ class JsonExporter:
                 return ""
             
             # Level-specific owner value mappings (check these first, before NPC lookup)
-            # On level 2, owner value 10 (Lanugo's conversation slot) maps to mountainmen
-            if level_num == 1 and owner_value == 10:
-                return 'mountainmen'
-            # On level 3, owner value 11 (Thorlson's conversation slot) maps to lizardmen
-            if level_num == 2 and owner_value == 11:
-                return 'lizardmen'
-            # On level 4, owner value 13 (Morlock's conversation slot) maps to knights
-            if level_num == 3 and owner_value == 13:
-                return 'knights'
-            # On level 4, owner value 15 maps to trolls
-            if level_num == 3 and owner_value == 15:
-                return 'trolls'
-            # On level 4, owner value 31 maps to knights (Level 4 is "The Knights")
-            if level_num == 3 and owner_value == 31:
-                return 'knights'
-            # On level 7, owner value 20 (Gulik's conversation slot) maps to golems
-            if level_num == 6 and owner_value == 20:
-                return 'golems'
-            
-            # First, check if we have a known name-to-faction mapping
-            # This takes precedence because some NPCs might not be on the level or might be the wrong type
-            known_name_to_faction = {
-                'marrowsuck': 'green goblins',  # Green goblin leader
-                'vernix': 'gray goblins',       # Gray goblin leader  
-                'garamon': 'outcasts',          # Outcast leader
-                'lanugo': 'mountainmen',       # Mountainman leader on level 2
-            }
+            override = _OWNER_OVERRIDE.get((level_num, owner_value))
+            if override is not None:
+                return override
             
             # Level-specific owner value mappings
             # On level 2, if there are mountainmen on the level, prefer them over reapers
             # This handles cases where reapers share conversation slots with mountainmen
-            if level_num == 1 and npcs is not None:
-                all_level_npcs = [npc for npc in npcs if npc.level == 1]
-                mountainmen_on_level = [npc for npc in all_level_npcs if get_npc_type_name(npc.object_id) == 'mountainman']
-                reapers_on_level = [npc for npc in all_level_npcs if get_npc_type_name(npc.object_id) == 'reaper']
-                
-                # If there are mountainmen on level 2 and this owner value matches reapers' conversation slot
-                # (or if reapers exist and we might get reapers as result), prefer mountainmen
-                if mountainmen_on_level and reapers_on_level:
-                    matching_reapers = [npc for npc in reapers_on_level if npc.conversation_slot == owner_value]
-                    # If this owner value matches reapers, return mountainmen instead
-                    if matching_reapers:
-                        return 'mountainmen'
-            
+            if level_num == 1 and 'mountainman' in npc_types_on_level.get(1, ()):
+                # If there are mountainmen on level 2 and this owner value matches reapers'
+                # conversation slot, prefer mountainmen
+                if 'reaper' in npc_types_by_level_slot.get((1, owner_value), ()):
+                    return 'mountainmen'
+            
+            # Known leader name -> faction mapping. This takes precedence because some NPCs
+            # might not be on the level or might be the wrong type
             if owner_value in npc_names:
-                npc_name = npc_names[owner_value].lower()
-                if is_valid_npc_name(npc_names[owner_value]) and npc_name in known_name_to_faction:
-                    return known_name_to_faction[npc_name]
+                npc_name = npc_names[owner_value]
+                if _is_valid_npc_name(npc_name):
+                    faction = _KNOWN_NAME_TO_FACTION.get(npc_name.lower())
+                    if faction:
+                        return faction
             
             # Special case for npc #36 - check for rats on the level
             # Owner values might map to NPC indices, conversation slots, or other identifiers
@@ -1158,93 +1411,38 @@ class JsonExporter:
                 # Direct mapping for level 1 (0-indexed)
                 if level_num == 0:
                     return 'rats'
-                if npcs is not None and level_num is not None:
-                    # Strategy 1: Check if there's an NPC with index 36 that is a rat
-                    npc_with_index_36 = [npc for npc in npcs if npc.level == level_num and npc.index == 36]
-                    if npc_with_index_36:
-                        for npc in npc_with_index_36:
-                            if get_npc_type_name(npc.object_id) == 'rat':
-                                return 'rats'
-                    
-                    # Strategy 2: Check if there are NPCs with conversation slot 36 that are rats
-                    rat_npcs_with_slot = [
-                        npc for npc in npcs
-                        if npc.level == level_num and npc.conversation_slot == 36 and get_npc_type_name(npc.object_id) == 'rat'
-                    ]
-                    if rat_npcs_with_slot:
-                        return 'rats'
-                    
-                    # Strategy 3: Check if there are NPCs with owner field 36 that are rats
-                    rat_npcs_with_owner = [
-                        npc for npc in npcs
-                        if npc.level == level_num and npc.owner == 36 and get_npc_type_name(npc.object_id) == 'rat'
-                    ]
-                    if rat_npcs_with_owner:
-                        return 'rats'
-                    
-                    # Strategy 4: If no specific match, check if there are any rats on the level at all
-                    # (owner 36 on level 1 typically means rats)
-                    level_npcs = [npc for npc in npcs if npc.level == level_num]
-                    rat_npcs = [npc for npc in level_npcs if get_npc_type_name(npc.object_id) == 'rat']
-                    if rat_npcs:
-                        return 'rats'
-                # If we don't have level info but have NPCs, check all rats
-                elif npcs is not None and len(npcs) > 0:
-                    # Check for NPC with index 36
-                    npc_with_index_36 = [npc for npc in npcs if npc.index == 36]
-                    if npc_with_index_36:
-                        for npc in npc_with_index_36:
-                            if get_npc_type_name(npc.object_id) == 'rat':
-                                return 'rats'
-                    # Otherwise check all rats
-                    rat_npcs = [npc for npc in npcs if get_npc_type_name(npc.object_id) == 'rat']
-                    if rat_npcs:
+                # A rat with index, conversation slot or owner 36 is also just a rat on the
+                # level, so any rat on the level (or anywhere, without level info) matches
+                if level_num is not None:
+                    if 'rat' in npc_types_on_level.get(level_num, ()):
                         return 'rats'
+                elif 'rat' in all_npc_types:
+                    return 'rats'
             
             # If we have NPCs and level info, try to determine faction from NPC types
-            if npcs is not None and level_num is not None and len(npcs) > 0:
+            if npcs and level_num is not None:
                 # The owner_value might represent:
                 # 1. Conversation slot (npc_whoami)
                 # 2. NPC index in the object list
                 # 3. NPC owner field
-                # Try all three strategies
-                
-                # Strategy 1: Match by conversation slot
-                matching_npcs = [
-                    npc for npc in npcs
-                    if npc.level == level_num and npc.conversation_slot == owner_value
-                ]
-                
-                # Strategy 2: Match by NPC index (owner value might be object index)
-                if not matching_npcs:
-                    matching_npcs = [
-                        npc for npc in npcs
-                        if npc.level == level_num and npc.index == owner_value
-                    ]
-                
-                # Strategy 3: Match by NPC owner field
-                if not matching_npcs:
-                    matching_npcs = [
-                        npc for npc in npcs
-                        if npc.level == level_num and npc.owner == owner_value
-                    ]
+                # Try all three strategies, in that order
+                level_key = (level_num, owner_value)
+                matching_types = (
+                    npc_types_by_level_slot.get(level_key) or
+                    npc_types_by_level_index.get(level_key) or
+                    npc_types_by_level_owner.get(level_key)
+                )
                 
                 # If still no matches and owner_value is a known conversation slot,
                 # try to find NPCs with that conversation slot on ANY level (maybe the NPC
                 # is on a different level but items on this level are owned by them)
-                if not matching_npcs and owner_value in npc_names:
-                    matching_npcs = [
-                        npc for npc in npcs
-                        if npc.conversation_slot == owner_value
-                    ]
+                if not matching_types and owner_value in npc_names:
+                    matching_types = npc_types_by_slot.get(owner_value)
                     # If we found NPCs on other levels, use the first one's type
                     # (assuming faction is consistent across levels)
-                    if matching_npcs:
+                    if matching_types:
                         # Use the first NPC's type (or most common if multiple)
-                        type_counts = {}
-                        for npc in matching_npcs:
-                            npc_type = get_npc_type_name(npc.object_id)
-                            type_counts[npc_type] = type_counts.get(npc_type, 0) + 1
+                        type_counts = Counter(matching_types)
                         if type_counts:
                             # Level-specific overrides: prioritize certain factions on specific levels
                             # On level 2, if the conversation slot is Lanugo (10), use mountainmen
@@ -1256,59 +1454,45 @@ class JsonExporter:
                                 if 'reaper' in type_counts:
                                     dominant_type = 'mountainman'
                                 else:
-                                    dominant_type = max(type_counts.items(), key=lambda x: x[1])[0]
+                                    dominant_type = type_counts.most_common(1)[0][0]
                             else:
-                                dominant_type = max(type_counts.items(), key=lambda x: x[1])[0]
-                            faction_name = get_faction_name_from_npc_type(dominant_type)
+                                dominant_type = type_counts.most_common(1)[0][0]
+                            faction_name = _faction_name_from_npc_type(dominant_type)
                             return faction_name
                 
-                if matching_npcs:
-                    # Count NPC types
-                    type_counts = {}
-                    for npc in matching_npcs:
-                        npc_type = get_npc_type_name(npc.object_id)
-                        type_counts[npc_type] = type_counts.get(npc_type, 0) + 1
-                    
-                    # Find the most common NPC type
+                if matching_types:
+                    # Count NPC types and find the most common one (first seen wins ties)
+                    type_counts = Counter(matching_types)
                     if type_counts:
-                        dominant_type = max(type_counts.items(), key=lambda x: x[1])[0]
+                        dominant_type = type_counts.most_common(1)[0][0]
                     else:
                         dominant_type = None
                     
                     if dominant_type:
-                        faction_name = get_faction_name_from_npc_type(dominant_type)
+                        faction_name = _faction_name_from_npc_type(dominant_type)
                         
                         # Level 2 specific override: if result would be "reapers" but mountainmen exist, use mountainmen
                         # This is a known game data issue where reapers share conversation slots with mountainmen on level 2
-                        if level_num == 1 and dominant_type == 'reaper' and npcs is not None:
-                            # Check if mountainmen are in the matching NPCs
-                            if 'mountainman' in type_counts:
+                        if level_num == 1 and dominant_type == 'reaper':
+                            # Use mountainmen if they are among the matching NPCs or anywhere on level 2
+                            if 'mountainman' in type_counts or 'mountainman' in npc_types_on_level.get(1, ()):
                                 dominant_type = 'mountainman'
-                                faction_name = get_faction_name_from_npc_type(dominant_type)
-                            else:
-                                # Check all NPCs on level 2 - if there are mountainmen, use them
-                                all_level_npcs = [npc for npc in npcs if npc.level == 1]
-                                mountainmen_on_level = [npc for npc in all_level_npcs if get_npc_type_name(npc.object_id) == 'mountainman']
-                                if mountainmen_on_level:
-                                    dominant_type = 'mountainman'
-                                    faction_name = get_faction_name_from_npc_type(dominant_type)
+                                faction_name = _faction_name_from_npc_type(dominant_type)
                         
                         # Check if there's a named NPC (leader) with this conversation slot
                         has_named_npc = (
                             owner_value in npc_names and 
                             npc_names[owner_value] and
-                            is_valid_npc_name(npc_names[owner_value])
+                            _is_valid_npc_name(npc_names[owner_value])
                         )
                         
                         # Final safety check: on level 2, if result is "reapers" but mountainmen exist, use mountainmen
-                        if level_num == 1 and faction_name == 'reapers' and npcs is not None:
-                            all_level_npcs = [npc for npc in npcs if npc.level == 1]
-                            mountainmen_on_level = [npc for npc in all_level_npcs if get_npc_type_name(npc.object_id) == 'mountainman']
-                            if mountainmen_on_level:
+                        if level_num == 1 and faction_name == 'reapers':
+                            if 'mountainman' in npc_types_on_level.get(1, ()):
                                 faction_name = 'mountainmen'
                         
                         # If there's a named NPC and multiple NPCs, show as "faction (leader)"
-                        if has_named_npc and len(matching_npcs) > 1:
+                        if has_named_npc and len(matching_types) > 1:
                             return f"{faction_name} (leader)"
                         elif has_named_npc:
                             # Single named NPC - return faction name
@@ -1316,203 +1500,208 @@ class JsonExporter:
                         else:
                             return faction_name
             
-            # If we have NPC data but couldn't find a match, or if we found NPCs but they might be wrong type,
-            # try to infer from NPC name using known mappings
-            if npcs is not None and len(npcs) > 0 and owner_value in npc_names:
-                npc_name = npc_names[owner_value].lower()
-                if is_valid_npc_name(npc_names[owner_value]):
-                    # Known mappings from game knowledge - these NPCs belong to specific factions
-                    name_to_faction = {
-                        'marrowsuck': 'green goblins',  # Green goblin leader
-                        'vernix': 'gray goblins',       # Gray goblin leader
-                        'garamon': 'outcasts',          # Outcast leader
-                    }
-                    
-                    # Check if we have a direct mapping
-                    if npc_name in name_to_faction:
-                        return name_to_faction[npc_name]
-            
             # Fallback: Only use NPC name lookup if we don't have NPC data available
             # (This preserves backward compatibility but shouldn't be used when NPCs are available)
-            if npcs is None or len(npcs) == 0:
+            if not npcs:
                 if owner_value in npc_names:
                     npc_name = npc_names[owner_value]
-                    if is_valid_npc_name(npc_name):
+                    if _is_valid_npc_name(npc_name):
                         return npc_name
                 return f"NPC #{owner_value}"
             
             # Final fallback for unknown owner
             return f"NPC #{owner_value}"
         
-        def get_container_contents(level_num: int, container_link: int, 
-                                   visited: set = None) -> List[Dict]:
-            """Follow the object chain to get container contents."""
-            from ..constants import STATIC_CONTAINERS, CARRYABLE_CONTAINERS
-            if visited is None:
-                visited = set()
+        # Owner names keyed by (owner value, level) - the NPC data is fixed for the export
+        owner_name_cache = {}
+        
+        def get_owner_name(owner_value: int, object_id: int, level_num: int = None) -> str:
+            """Cached wrapper around build_owner_name."""
+            # Keys use owner field for lock ID, not NPC ownership
+            if 0x100 <= object_id <= 0x10E or owner_value <= 0:
+                return ""
+            key = (owner_value, level_num)
+            name = owner_name_cache.get(key)
+            if name is None:
+                name = owner_name_cache[key] = build_owner_name(owner_value, object_id, level_num)
+            return name
+        
+        # Completed top-level container walks, keyed by (level, first index in chain)
+        container_contents_cache = {}
+        # Visited flags for container walks, indexed by object index (10-bit, 0-1023).
+        # Every walk clears the flags it set, so one buffer serves all walks.
+        container_visited = bytearray(0x400)
+        
+        def get_container_contents(level_num: int, container_link: int) -> List[Dict]:
+            """Follow the object chain to get container contents.
             
-            contents = []
-            current_idx = container_link
+            Nested containers are walked with an explicit stack instead of recursion.
+            A single visited bitset is shared by the whole walk: each chain clears the
+            indices it set when it finishes, so sibling chains see exactly the
+            visited state of their parent (same cycle guard as a per-descent copy).
+            """
+            cache_key = (level_num, container_link)
+            cached = container_contents_cache.get(cache_key)
+            # Callers always get shallow copies, so they never share entries with the cache
+            if cached is not None:
+                return [dict(c) for c in cached]
             
-            while current_idx > 0 and current_idx not in visited:
-                visited.add(current_idx)
+            contents = []
+            container_contents_cache[cache_key] = contents
+            level_items = items_by_level_index.get(level_num)
+            if level_items is None:
+                return []
+            
+            visited = container_visited
+            # Frame: [current index, output list, indices visited by this chain, owning content_item]
+            stack = [[container_link, contents, [], None]]
+            
+            while stack:
+                frame = stack[-1]
+                current_idx = frame[0]
+                item = None
+                if current_idx > 0 and not visited[current_idx]:
+                    visited[current_idx] = 1
+                    frame[2].append(current_idx)
+                    item = level_items.get(current_idx)
                 
-                if level_num in items_by_level_index:
-                    item = items_by_level_index[level_num].get(current_idx)
-                    if item:
-                        # Skip lock objects (0x10F) - they're not container contents
-                        if item.object_id == 0x10F:
-                            # Lock object - follow its next_index to get actual contents
-                            current_idx = item.next_index
-                            continue
-                        
-                        item_dict = item.to_dict()
-                        detailed_cat = item_dict.get('detailed_category', '')
-                        obj_class = item_dict.get('object_class', 'unknown')
-                        
-                        # Check if this is a quest book (e.g., Book of Honesty) in container
-                        cont_category = category_map.get(detailed_cat, category_map.get(obj_class, 'misc'))
-                        if 0x130 <= item.object_id <= 0x137 and item.is_quantity and item.quantity >= 512:
-                            from ..constants import is_quest_book
-                            text_idx = item.quantity - 512
-                            if is_quest_book(text_idx):
-                                cont_category = 'quest'
-                        
-                        # Get rich description and effect for this item
-                        item_desc = get_item_description(
-                            item, item.object_id, item.is_enchanted, item.is_quantity,
-                            item.quantity, item.quality, 
-                            getattr(item, 'owner', 0),
-                            item.special_link, level_num
-                        )
-                        item_effect = get_item_effect(
-                            item, item.object_id, item.is_enchanted, item.is_quantity,
-                            item.quantity, item.quality, item.special_link, level_num
-                        )
-                        
-                        # Determine actual quantity (not enchantment data)
-                        # If is_quantity and quantity >= 512, it's actually enchantment data
-                        actual_quantity = 1
-                        if item.is_quantity:
-                            if item.quantity < 512:
-                                actual_quantity = item.quantity
-                            # else: quantity >= 512 is enchantment data, show as 1
-                        
-                        content_item = {
-                            'object_id': item.object_id,
-                            'name': item.name or get_item_name(item.object_id),
-                            'category': cont_category,
-                            'quantity': actual_quantity,
-                        }
-                        # Add image path if available
-                        if image_paths and item.object_id in image_paths:
-                            content_item['image_path'] = image_paths[item.object_id]
-                        # Only include description and effect if they have meaningful values
-                        if item_desc:
-                            content_item['description'] = item_desc
-                        if item_effect:
-                            content_item['effect'] = item_effect
+                if not item:
+                    # End of this chain - restore the parent's visited state
+                    stack.pop()
+                    for idx in frame[2]:
+                        visited[idx] = 0
+                    owner_item = frame[3]
+                    if owner_item is not None and not owner_item['contents']:
+                        del owner_item['contents']
+                    continue
+                
+                # Skip lock objects (0x10F) - they're not container contents
+                if item.object_id == 0x10F:
+                    # Lock object - follow its next_index to get actual contents
+                    frame[0] = item.next_index
+                    continue
+                
+                detailed_cat = item.detailed_category
+                obj_class = item.object_class
+                
+                # Check if this is a quest book (e.g., Book of Honesty) in container
+                cont_category = resolve_category(detailed_cat, obj_class)
+                if 0x130 <= item.object_id <= 0x137 and item.is_quantity and item.quantity >= 512:
+                    text_idx = item.quantity - 512
+                    if is_quest_book(text_idx):
+                        cont_category = 'quest'
+                
+                # Get rich description and effect for this item
+                item_desc = get_item_description(
+                    item, item.object_id, item.is_enchanted, item.is_quantity,
+                    item.quantity, item.quality, 
+                    item.owner,
+                    item.special_link, level_num
+                )
+                item_effect = get_item_effect(
+                    item, item.object_id, item.is_enchanted, item.is_quantity,
+                    item.quantity, item.quality, item.special_link, level_num
+                )
+                
+                # Determine actual quantity (not enchantment data)
+                # If is_quantity and quantity >= 512, it's actually enchantment data
+                actual_quantity = 1
+                if item.is_quantity:
+                    if item.quantity < 512:
+                        actual_quantity = item.quantity
+                    # else: quantity >= 512 is enchantment data, show as 1
+                
+                content_item = {
+                    'object_id': item.object_id,
+                    'name': item.name or get_item_name(item.object_id),
+                    'category': cont_category,
+                    'quantity': actual_quantity,
+                }
+                # Add image path if available
+                if image_paths and item.object_id in image_paths:
+                    content_item['image_path'] = image_paths[item.object_id]
+                # Only include description and effect if they have meaningful values
+                if item_desc:
+                    content_item['description'] = item_desc
+                if item_effect:
+                    content_item['effect'] = item_effect
 
-                        # Wands: export numeric charges (from linked spell object)
-                        if 0x98 <= item.object_id <= 0x9B:
-                            _, charges = get_wand_spell_and_charges(
-                                level_num, item.is_quantity, item.quality, item.special_link
-                            )
-                            content_item['charges'] = charges
-                        
-                        # Add owner information for items inside containers
-                        item_owner = getattr(item, 'owner', 0)
-                        if item_owner > 0 and not (0x100 <= item.object_id <= 0x10E):
-                            content_item['owner'] = item_owner
-                            cont_owner_name = get_owner_name(item_owner, item.object_id, level_num, npcs)
-                            if cont_owner_name:
-                                content_item['owner_name'] = cont_owner_name
-                        
-                        # Add item stats (weapon damage, armor stats, weight, nutrition, intoxication) for contained items
-                        cont_item_stats = get_item_stats(item.object_id)
-                        if cont_item_stats:
-                            if 'slash_damage' in cont_item_stats:
-                                content_item['slash_damage'] = cont_item_stats['slash_damage']
-                            if 'bash_damage' in cont_item_stats:
-                                content_item['bash_damage'] = cont_item_stats['bash_damage']
-                            if 'stab_damage' in cont_item_stats:
-                                content_item['stab_damage'] = cont_item_stats['stab_damage']
-                            if 'protection' in cont_item_stats:
-                                content_item['protection'] = cont_item_stats['protection']
-                            if 'durability' in cont_item_stats:
-                                # max_durability: from OBJECTS.DAT - the item type's maximum durability
-                                content_item['max_durability'] = cont_item_stats['durability']
-                                # quality: from placed object data (bits 0-5 of word 2, range 0-63)
-                                if item.object_id <= 0x3F:  # Weapons and Armor
-                                    content_item['quality'] = item.quality
-                            if 'weight' in cont_item_stats:
-                                content_item['weight'] = cont_item_stats['weight']
-                            if 'nutrition' in cont_item_stats:
-                                content_item['nutrition'] = cont_item_stats['nutrition']
-                            if 'intoxication' in cont_item_stats:
-                                content_item['intoxication'] = cont_item_stats['intoxication']
-                        
-                        # If this item is also a container, get its contents recursively
-                        # Check for both portable containers and static ones (barrel, chest, urn, etc.)
-                        is_nested_container = (item.object_id in CARRYABLE_CONTAINERS) or (item.object_id in STATIC_CONTAINERS)
-                        if is_nested_container and item.special_link > 0:
-                            nested_contents = get_container_contents(
-                                level_num, item.special_link, visited.copy()
-                            )
-                            if nested_contents:
-                                content_item['contents'] = nested_contents
-                        
-                        contents.append(content_item)
-                        current_idx = item.next_index
-                    else:
-                        break
-                else:
-                    break
-            
-            return contents
+                # Wands: export numeric charges (from linked spell object)
+                if 0x98 <= item.object_id <= 0x9B:
+                    _, charges = get_wand_spell_and_charges(
+                        level_num, item.is_quantity, item.quality, item.special_link
+                    )
+                    content_item['charges'] = charges
+                
+                # Add owner information for items inside containers
+                item_owner = item.owner
+                if item_owner > 0 and not (0x100 <= item.object_id <= 0x10E):
+                    content_item['owner'] = item_owner
+                    cont_owner_name = get_owner_name(item_owner, item.object_id, level_num)
+                    if cont_owner_name:
+                        content_item['owner_name'] = cont_owner_name
+                
+                # Add item stats (weapon damage, armor stats, weight, nutrition, intoxication) for contained items
+                combat_stats, extra_stats = get_web_item_stats(item.object_id)
+                content_item.update(combat_stats)
+                # quality: from placed object data (bits 0-5 of word 2, range 0-63)
+                if 'max_durability' in combat_stats and item.object_id <= 0x3F:  # Weapons and Armor
+                    content_item['quality'] = item.quality
+                content_item.update(extra_stats)
+                
+                frame[1].append(content_item)
+                frame[0] = item.next_index
+                
+                # If this item is also a container, walk its contents next
+                # Check for both portable containers and static ones (barrel, chest, urn, etc.)
+                is_nested_container = item.object_id in _ALL_CONTAINERS
+                if is_nested_container and item.special_link > 0:
+                    nested_contents = content_item['contents'] = []
+                    stack.append([item.special_link, nested_contents, [], content_item])
+            
+            return [dict(c) for c in contents]
         
         # Process placed objects - filter out templates at (0,0) and NPCs
-        objects_by_level = {i: [] for i in range(9)}
+        objects_by_level = defaultdict(list)
+        # Placed items arrive grouped by level - only re-bind the level's lookups when it changes
+        current_level = None
+        level_items = {}    # items_by_level_index for the current level
+        level_objects = {}  # Level.objects for the current level
         
         for item in placed_items:
-            item_dict = item.to_dict()
-            pos = item_dict.get('position', {})
-            tile_x = pos.get('tile_x', 0)
-            tile_y = pos.get('tile_y', 0)
+            # Read fields straight off the GameObjectInfo - building item.to_dict()
+            # per object only to pick a few values back out is the dominant cost here
+            obj_id = item.object_id
+            tile_x = item.tile_x
+            tile_y = item.tile_y
             
-            # Skip objects at origin (templates)
-            if tile_x == 0 and tile_y == 0:
+            # Cheap triage first: skip NPCs (exported separately), secret doors
+            # (exported in the secrets array) and objects at origin (templates)
+            if 0x40 <= obj_id <= 0x7F or obj_id == 0x147 or (tile_x == 0 and tile_y == 0):
                 continue
             
             # Get object class to determine if we should show invisible objects
-            obj_class = item_dict.get('object_class', 'unknown')
+            obj_class = item.object_class
             
             # Skip invisible objects EXCEPT for traps and triggers
             # (traps/triggers are typically invisible game mechanics we want to show on the map)
-            if item_dict.get('is_invisible', False):
-                if obj_class not in ('trap', 'trigger'):
-                    continue
-            
-            # Skip NPCs - they are exported separately
-            obj_id = item_dict.get('object_id', 0)
-            if 0x40 <= obj_id <= 0x7F:
+            if item.is_invisible and obj_class not in _INVISIBLE_KEEP:
                 continue
             
-            # Skip secret doors - they are exported in the secrets array
-            if obj_id == 0x147:
-                continue
-                
-            level = item_dict.get('level', 0)
+            level = item.level
+            if level != current_level:
+                current_level = level
+                level_items = items_by_level_index.get(level, {})
+                level_obj = levels.get(level) if levels else None
+                level_objects = level_obj.objects if level_obj else {}
+            
             # Use detailed_category if available, otherwise fall back to object_class
-            detailed_cat = item_dict.get('detailed_category', '')
-            obj_class = item_dict.get('object_class', 'unknown')
+            detailed_cat = item.detailed_category
             # First try detailed category, then base category
-            category = category_map.get(detailed_cat, category_map.get(obj_class, 'misc'))
+            category = resolve_category(detailed_cat, obj_class)
             
             # Check if this is a quest book (e.g., Book of Honesty)
-            obj_id = item.object_id
             if 0x130 <= obj_id <= 0x137 and item.is_quantity and item.quantity >= 512:
-                from ..constants import is_quest_book
                 text_idx = item.quantity - 512
                 if is_quest_book(text_idx):
                     category = 'quest'
@@ -1529,13 +1718,10 @@ class JsonExporter:
             # Check if this is a move trigger that links to a level-changing teleport trap (stairs)
             stairs_dest_level = None  # Will be set if this is a stairs trigger
             if obj_id == 0x1A0:  # move_trigger
-                from ..constants.traps import is_trap, is_level_transition_teleport
-                TELEPORT_TRAP_ID = 0x181  # teleport_trap
-                if special_link > 0 and levels:
-                    level_obj = levels.get(level)
-                    if level_obj and special_link in level_obj.objects:
-                        target = level_obj.objects[special_link]
-                        if is_trap(target.item_id) and target.item_id == TELEPORT_TRAP_ID:
+                if special_link > 0:
+                    target = level_objects.get(special_link)
+                    if target is not None:
+                        if target.item_id == _TELEPORT_TRAP_ID:
                             # Check if this teleport trap is a level transition
                             # Use trigger coordinates for level transition detection
                             # (teleport traps at 0,0 are templates, use trigger position instead)
@@ -1561,7 +1747,7 @@ class JsonExporter:
             # Create simplified object for web
             # Use name from placed item, but prefer item_types name for quest/enchanted items
             # (item_types should have the identified names)
-            item_name = item_dict.get('name', '')
+            item_name = item.name
             
             # For quest items, talismans, and enchanted items, prefer item_types name
             # which should have the identified name from _get_identified_name()
@@ -1575,12 +1761,12 @@ class JsonExporter:
                 item_name = item_types[obj_id].name
             
             web_obj = {
-                'id': item_dict.get('index', 0),
+                'id': item.index,
                 'object_id': obj_id,
                 'name': item_name,
                 'tile_x': tile_x,
                 'tile_y': tile_y,
-                'z': pos.get('z', 0),
+                'z': item.z_pos,
                 'category': category,
                 'object_class': obj_class,
                 'detailed_category': detailed_cat,
@@ -1595,7 +1781,7 @@ class JsonExporter:
             # - Switches (0x162): TMOBJ.GR at index (12 + (flags & 0x07))
             # - Tmap objects (0x16E, 0x16F): W64.TR wall texture at index (owner)
             
-            item_flags = getattr(item, 'flags', 0) or 0
+            item_flags = item.flags
             
             # Per uw-formats.txt section 6.1:
             # - Writings (0x166): texture from tmobj.gr at image "flags" + 20
@@ -1662,16 +1848,7 @@ class JsonExporter:
             # Add quantity for stackable items
             # is_quantity flag means the quantity_or_link field holds a count
             # quantity >= 512 means it's enchantment data, not a real quantity
-            
-            # Items that always have quantity (gems, coins):
-            quantity_capable_items = [
-                0x0A2,  # Ruby
-                0x0A3,  # Red gem
-                0x0A4,  # Small blue gem (tiny blue gem)
-                0x0A6,  # Sapphire
-                0x0A7,  # Emerald
-            ]
-            can_have_quantity = obj_id in quantity_capable_items
+            can_have_quantity = obj_id in _QUANTITY_CAPABLE_ITEMS
             
             if is_quantity and quantity > 0 and quantity < 512:
                 web_obj['quantity'] = quantity
@@ -1688,27 +1865,16 @@ class JsonExporter:
             # Add owner information (for items that belong to NPCs)
             # Keys use owner for lock ID, which is already shown in effect/description
             # Texture map objects, traps, and triggers should not have ownership attributes
-            from ..constants import is_special_tmap
-            from ..constants.traps import is_trap, is_trigger
-            # Explicit object ids that must never expose ownership semantics in the web UI,
-            # even if they have a non-zero raw owner field.
-            never_owned_object_ids = {
-                0x1CA,  # 458 - silver tree
-                0x0C2, 0x0C3,  # skulls
-                0x0C4, 0x0C5,  # bones
-                0x0C6, 0x0DC,  # pile of bones (variants)
-            }
-
             if (
                 owner > 0
-                and obj_id not in never_owned_object_ids
+                and obj_id not in _NEVER_OWNED_ITEMS
                 and not (0x100 <= obj_id <= 0x10E)  # keys use owner for lock id
                 and not is_special_tmap(obj_id)
                 and not is_trap(obj_id)
                 and not is_trigger(obj_id)
             ):
                 web_obj['owner'] = owner
-                owner_name = get_owner_name(owner, obj_id, level, npcs)
+                owner_name = get_owner_name(owner, obj_id, level)
                 if owner_name:
                     web_obj['owner_name'] = owner_name
             
@@ -1720,66 +1886,36 @@ class JsonExporter:
                 web_obj['owner_raw'] = owner
             
             # Include extra_info for special object types (potions, doors, etc.)
-            extra_info = item_dict.get('extra_info', {})
+            extra_info = item.extra_info
             if extra_info:
                 web_obj['extra_info'] = extra_info
             
             # Add item stats (weapon damage, armor stats, weight, nutrition, intoxication)
             item_stats = get_item_stats(obj_id)
             if item_stats:
-                if 'slash_damage' in item_stats:
-                    web_obj['slash_damage'] = item_stats['slash_damage']
-                if 'bash_damage' in item_stats:
-                    web_obj['bash_damage'] = item_stats['bash_damage']
-                if 'stab_damage' in item_stats:
-                    web_obj['stab_damage'] = item_stats['stab_damage']
-                if 'protection' in item_stats:
-                    web_obj['protection'] = item_stats['protection']
-                if 'durability' in item_stats:
-                    # max_durability: from OBJECTS.DAT - the item type's maximum durability
-                    web_obj['max_durability'] = item_stats['durability']
+                combat_stats, _ = get_web_item_stats(obj_id)
+                web_obj.update(combat_stats)
+                if 'max_durability' in combat_stats:
                     # quality: from placed object data (bits 0-5 of word 2, range 0-63)
                     # This represents the item's current condition as a percentage (0=destroyed, 63=pristine)
                     if obj_id <= 0x3F:  # Weapons (0x00-0x1F) and Armor (0x20-0x3F)
                         web_obj['quality'] = quality
-                # Don't add weight or capacity for storage items (barrels, chests, urns, cauldrons, tables)
-                # Storage items should not display these stats in the UI
-                from ..constants import STATIC_CONTAINERS
-                is_storage = obj_id in STATIC_CONTAINERS
-                # Don't add weight for scenery items (0xC0-0xDF), campfire (0x12A), or fountain (0x12E)
-                # But allow weight for items categorized as useless_item (like pile of debris)
-                is_scenery = ((0xC0 <= obj_id <= 0xDF) or obj_id in (0x12A, 0x12E)) and detailed_cat != 'useless_item'
-                if 'weight' in item_stats and not is_storage and not is_scenery:
-                    web_obj['weight'] = item_stats['weight']
-                if 'capacity' in item_stats and not is_storage:
-                    web_obj['capacity'] = item_stats['capacity']
-                if 'accepts' in item_stats:
-                    web_obj['accepts'] = item_stats['accepts']
-                if 'nutrition' in item_stats:
-                    web_obj['nutrition'] = item_stats['nutrition']
-                if 'intoxication' in item_stats:
-                    web_obj['intoxication'] = item_stats['intoxication']
+                web_obj.update(get_placed_extra_stats(obj_id, detailed_cat))
             
             # For containers (both portable and static like barrels/chests), add their contents
-            special_link = item_dict.get('special_link', 0)
-            obj_id = item.object_id
             # Check if this is any type of container
-            from ..constants import STATIC_CONTAINERS, CARRYABLE_CONTAINERS
-            is_container_item = (obj_id in CARRYABLE_CONTAINERS) or (obj_id in STATIC_CONTAINERS)
+            is_container_item = obj_id in _ALL_CONTAINERS
             if is_container_item and special_link > 0:
                 # Check if special_link points to a lock object (0x10F) - if so, follow lock's next_index
-                if level in items_by_level_index:
-                    link_obj = items_by_level_index[level].get(special_link)
-                    if link_obj and link_obj.object_id == 0x10F:
-                        # special_link points to lock, contents are in lock's next_index chain
-                        if link_obj.next_index > 0:
-                            contents = get_container_contents(level, link_obj.next_index)
-                        else:
-                            contents = []
+                link_obj = level_items.get(special_link)
+                if link_obj and link_obj.object_id == 0x10F:
+                    # special_link points to lock, contents are in lock's next_index chain
+                    if link_obj.next_index > 0:
+                        contents = get_container_contents(level, link_obj.next_index)
                     else:
-                        # special_link points directly to contents
-                        contents = get_container_contents(level, special_link)
+                        contents = []
                 else:
+                    # special_link points directly to contents
                     contents = get_container_contents(level, special_link)
                 
                 if contents:
@@ -1788,42 +1924,45 @@ class JsonExporter:
             objects_by_level[level].append(web_obj)
         
         # Process NPCs - merge with creature type data
-        npcs_by_level = {i: [] for i in range(9)}
+        npcs_by_level = defaultdict(list)
+        # NPCs arrive grouped by level - only look up the level's creature map when it changes
+        current_level = None
+        current_creature_types = {}
+        # Conversation slots that actually have a conversation
+        conv_keys = frozenset(conversations) if conversations else frozenset()
         
         for npc in npcs:
-            npc_dict = npc.to_dict()
-            pos = npc_dict.get('position', {})
-            tile_x = pos.get('tile_x', 0)
-            tile_y = pos.get('tile_y', 0)
+            tile_x = npc.tile_x
+            tile_y = npc.tile_y
             
             # Skip NPCs at origin (templates)
             if tile_x == 0 and tile_y == 0:
                 continue
                 
-            level = npc_dict.get('level', 0)
-            npc_index = npc_dict.get('index', 0)
+            level = npc.level
+            npc_index = npc.index
+            obj_id = npc.object_id
             
             # Get creature type name from the placed items data
-            creature_type = ""
-            if level in creature_type_by_level_index:
-                creature_type = creature_type_by_level_index[level].get(npc_index, "")
+            if level != current_level:
+                current_level = level
+                current_creature_types = creature_type_by_level_index.get(level, {})
+            creature_type = current_creature_types.get(npc_index, "")
             
             if not creature_type:
-                obj_id = npc_dict.get('object_id', 0)
                 creature_type = get_item_name(obj_id)
             
-            conv_slot = npc_dict.get('conversation', {}).get('slot', 0)
-            npc_name = npc_dict.get('name', '')
+            conv_slot = npc.conversation_slot
+            npc_name = npc.name
             
-            if not is_valid_npc_name(npc_name) and conv_slot > 0 and conv_slot in npc_names:
+            if not _is_valid_npc_name(npc_name) and conv_slot > 0 and conv_slot in npc_names:
                 npc_name = npc_names.get(conv_slot, '')
             
-            if is_valid_npc_name(npc_name):
+            if _is_valid_npc_name(npc_name):
                 display_name = npc_name
             else:
                 display_name = creature_type
             
-            obj_id = npc_dict.get('object_id', 0)
             web_npc = {
                 'id': npc_index,
                 'object_id': obj_id,
@@ -1831,12 +1970,12 @@ class JsonExporter:
                 'creature_type': creature_type,
                 'tile_x': tile_x,
                 'tile_y': tile_y,
-                'z': pos.get('z', 0),
-                'hp': npc_dict.get('stats', {}).get('hp', 0),
-                'level': npc_dict.get('stats', {}).get('level', 0),
-                'attitude': npc_dict.get('behavior', {}).get('attitude_name', 'unknown'),
-                'attitude_raw': npc_dict.get('behavior', {}).get('attitude', 0),  # Store raw value (0-3)
-                'has_conversation': conv_slot > 0 and (conversations is not None and conv_slot in conversations),
+                'z': npc.z_pos,
+                'hp': npc.hp,
+                'level': npc.npc_level,
+                'attitude': npc.attitude_name,
+                'attitude_raw': npc.attitude,  # Store raw value (0-3)
+                'has_conversation': conv_slot > 0 and conv_slot in conv_keys,
                 'conversation_slot': conv_slot,
             }
             
@@ -1858,19 +1997,18 @@ class JsonExporter:
             npcs_by_level[level].append(web_npc)
         
         # Build object types lookup table (all 512 object types with names)
-        # Use category_map to convert Python categories to web categories
+        # Use _CATEGORY_MAP to convert Python categories to web categories
         object_types = {}
         if item_types:
             for obj_id, item_info in item_types.items():
-                # Map Python category to web category using the same category_map
-                web_category = category_map.get(item_info.category, 'misc')
+                # Map Python category to web category using the same _CATEGORY_MAP
+                web_category = _CATEGORY_MAP.get(item_info.category, 'misc')
                 entry = {
                     'name': item_info.name,
                     'category': web_category
                 }
                 
                 # Door type metadata (used by browser save-game parser/UI)
-                from ..constants import is_door
                 if is_door(obj_id):
                     props = item_info.properties or {}
                     if 'door_variant' in props:
@@ -1884,177 +2022,103 @@ class JsonExporter:
         
         # Build final data structure
         web_data = {
-            'metadata': {
-                'type': 'web_map_data',
-                'game': 'Ultima Underworld I',
-                'generated': datetime.now().isoformat(),
-                'grid_size': 64,
-                'num_levels': 9,
-            },
+            'metadata': self._meta('web_map_data', grid_size=64, num_levels=9),
             'object_types': object_types,
-            'categories': [
-                # Weapons & Armor
-                {'id': 'weapons', 'name': 'Weapons', 'color': '#e03131'},
-                {'id': 'armor', 'name': 'Armor', 'color': '#5c7cfa'},
-                # Keys & Containers
-                {'id': 'keys', 'name': 'Keys', 'color': '#fab005'},
-                {'id': 'containers', 'name': 'Containers', 'color': '#f08c00'},
-                {'id': 'storage', 'name': 'Storage', 'color': '#d9480f'},
-                # Food & Potions
-                {'id': 'food', 'name': 'Food', 'color': '#a9e34b'},
-                {'id': 'potions', 'name': 'Potions', 'color': '#f783ac'},
-                # Books & Scrolls
-                {'id': 'books_scrolls', 'name': 'Books & Scrolls', 'color': '#e8d4b8'},
-                {'id': 'spell_scrolls', 'name': 'Spell Scrolls', 'color': '#da77f2'},
-                {'id': 'writings', 'name': 'Writings', 'color': '#d4c4a8'},
-                {'id': 'gravestones', 'name': 'Gravestones', 'color': '#c4a484'},
-                # Magic Items - split by type
-                {'id': 'runes', 'name': 'Runestones', 'color': '#9775fa'},
-                {'id': 'wands', 'name': 'Wands', 'color': '#7950f2'},
-                # Treasure & Light
-                {'id': 'treasure', 'name': 'Treasure', 'color': '#fcc419'},
-                {'id': 'light', 'name': 'Light Sources', 'color': '#ffe066'},
-                # Doors
-                {'id': 'doors_locked', 'name': 'Locked Doors', 'color': '#ff6b6b'},
-                {'id': 'doors_unlocked', 'name': 'Unlocked Doors', 'color': '#69db7c'},
-                {'id': 'secret_doors', 'name': 'Secret Doors', 'color': '#ffd43b'},
-                # Mechanics
-                {'id': 'switches', 'name': 'Switches & Levers', 'color': '#ffa94d'},
-                {'id': 'traps', 'name': 'Traps', 'color': '#ff8787'},
-                {'id': 'triggers', 'name': 'Triggers', 'color': '#748ffc'},
-                {'id': 'stairs', 'name': 'Stairs', 'color': '#6c757d'},
-                {'id': 'illusory_walls', 'name': 'Illusory Walls', 'color': '#ff00ff'},
-                # Special Objects
-                {'id': 'texture_objects', 'name': 'Texture Map Objects', 'color': '#845ef7'},
-                {'id': 'furniture', 'name': 'Furniture', 'color': '#b197a8'},
-                {'id': 'shrines', 'name': 'Shrines', 'color': '#d4a574'},
-                {'id': 'boulders', 'name': 'Boulders', 'color': '#8b7355'},
-                {'id': 'bridges', 'name': 'Bridges', 'color': '#8B5A2B'},
-                {'id': 'scenery', 'name': 'Scenery', 'color': '#a9a9a9'},
-                {'id': 'useless_item', 'name': 'Useless Items', 'color': '#868e96'},
-                {'id': 'animations', 'name': 'Animations', 'color': '#20c997'},
-                {'id': 'quest', 'name': 'Quest Items', 'color': '#22b8cf'},
-                {'id': 'misc', 'name': 'Miscellaneous', 'color': '#868e96'},
-            ],
+            'categories': _WEB_CATEGORIES,
             'levels': []
         }
         
-        level_names = [
-            "Level 1 - The Abyss Entrance",
-            "Level 2 - The Mountainfolk",
-            "Level 3 - The Lizardmen",
-            "Level 4 - The Knights",
-            "Level 5 - The Ghouls",
-            "Level 6 - The Seers",
-            "Level 7 - The Pits",
-            "Level 8 - The Tyball's Domain",
-            "Level 9 - The Chamber of Virtue",
-        ]
-        
-        # Process secrets into per-level lists
-        # First pass: collect all illusory walls (these take priority)
-        secrets_by_level = {i: [] for i in range(9)}
-        illusory_wall_coords = {i: set() for i in range(9)}  # Track coords with illusory walls
+        # Process secrets into per-level lists in a single pass
+        # Illusory walls take priority: a secret door is only kept if no illusory wall
+        # shares its tile. Both are keyed by coord (first one wins) and emitted walls first.
+        illusory_by_coord = defaultdict(dict)
+        door_by_coord = defaultdict(dict)
         
         if secrets:
-            # First pass: add illusory walls
             for secret in secrets:
-                secret_dict = secret.to_dict()
-                level = secret_dict.get('level', 0)
-                pos = secret_dict.get('position', {})
-                secret_type = secret_dict.get('type', '')
+                # Read fields straight off the Secret rather than building to_dict()
+                secret_type = secret.secret_type
                 
-                # Only process illusory walls in first pass
-                if secret_type != 'illusory_wall':
+                if secret_type == 'illusory_wall':
+                    by_coord = illusory_by_coord
+                    category = 'illusory_walls'  # Illusory walls get their own category
+                elif secret_type == 'secret_door':
+                    by_coord = door_by_coord
+                    category = 'secret_doors'  # Secret doors go with other secret doors
+                else:
                     continue
                 
+                level = secret.level
+                
                 # Skip secrets at origin (templates)
-                tile_x = pos.get('x', 0)
-                tile_y = pos.get('y', 0)
+                tile_x = secret.tile_x
+                tile_y = secret.tile_y
                 if tile_x == 0 and tile_y == 0:
                     continue
                 
                 coord = (tile_x, tile_y)
-                if coord in illusory_wall_coords[level]:
+                level_coords = by_coord[level]
+                if coord in level_coords:
                     continue  # Skip duplicate
                 
-                illusory_wall_coords[level].add(coord)
-                
-                web_secret = {
-                    'id': f"secret_{level}_{tile_x}_{tile_y}",
-                    'type': secret_type,
-                    'tile_x': tile_x,
-                    'tile_y': tile_y,
-                    'description': secret_dict.get('description', ''),
-                    'category': 'illusory_walls',  # Illusory walls get their own category
-                }
-                
-                details = secret_dict.get('details', {})
-                if details:
-                    web_secret['details'] = details
-                
-                secrets_by_level[level].append(web_secret)
-            
-            # Second pass: add secret doors only where there's no illusory wall
-            for secret in secrets:
-                secret_dict = secret.to_dict()
-                level = secret_dict.get('level', 0)
-                pos = secret_dict.get('position', {})
-                secret_type = secret_dict.get('type', '')
-                
-                # Only process secret doors in second pass
-                if secret_type != 'secret_door':
-                    continue
-                
-                tile_x = pos.get('x', 0)
-                tile_y = pos.get('y', 0)
-                if tile_x == 0 and tile_y == 0:
-                    continue
-                
-                coord = (tile_x, tile_y)
-                # Skip if there's already an illusory wall at this location
-                if coord in illusory_wall_coords[level]:
-                    continue
-                
-                # Also skip if we already have a secret door at this coord
-                existing_coords = {(s['tile_x'], s['tile_y']) for s in secrets_by_level[level]}
-                if coord in existing_coords:
-                    continue
-                
                 web_secret = {
                     'id': f"secret_{level}_{tile_x}_{tile_y}",
                     'type': secret_type,
                     'tile_x': tile_x,
                     'tile_y': tile_y,
-                    'description': secret_dict.get('description', ''),
-                    'category': 'secret_doors',  # Secret doors go with other secret doors
+                    'description': secret.description,
+                    'category': category,
                 }
                 
-                details = secret_dict.get('details', {})
+                details = secret.details
                 if details:
                     web_secret['details'] = details
                 
-                secrets_by_level[level].append(web_secret)
+                level_coords[coord] = web_secret
         
+        secrets_by_level = {}
         for level_num in range(9):
+            walls = illusory_by_coord[level_num]
+            secrets_by_level[level_num] = list(walls.values()) + [
+                door for coord, door in door_by_coord[level_num].items() if coord not in walls
+            ]
+        
+        # Every level gets its (possibly empty) lists in the output
+        for level_num in range(9):
+            level_object_list = objects_by_level[level_num]
+            level_npcs = npcs_by_level[level_num]
+            level_secrets = secrets_by_level[level_num]
             level_entry = {
                 'level': level_num,
-                'name': level_names[level_num] if level_num < len(level_names) else f"Level {level_num + 1}",
-                'objects': objects_by_level[level_num],
-                'npcs': npcs_by_level[level_num],
-                'secrets': secrets_by_level[level_num],
-                'object_count': len(objects_by_level[level_num]),
-                'npc_count': len(npcs_by_level[level_num]),
-                'secret_count': len(secrets_by_level[level_num]),
+                'name': _LEVEL_NAMES[level_num] if level_num < len(_LEVEL_NAMES) else f"Level {level_num + 1}",
+                'objects': level_object_list,
+                'npcs': level_npcs,
+                'secrets': level_secrets,
+                'object_count': len(level_object_list),
+                'npc_count': len(level_npcs),
+                'secret_count': len(level_secrets),
             }
             web_data['levels'].append(level_entry)
         
-        output_file = self._write_json('web_map_data.json', web_data)
+        data_bytes = self._serialize_json(web_data)
+        output_file = self.output_path / 'web_map_data.json'
+        output_file.write_bytes(data_bytes)
         
-        # Also copy to web/data/ folder for the web viewer
-        import shutil
+        # Pre-compressed JSON for serving with Content-Encoding: zstd
+        # (a stale .zst from an earlier export is removed so it can't shadow the new JSON)
+        zstd_bytes = zstandard.ZstdCompressor(level=10).compress(data_bytes) if ZSTD_AVAILABLE else None
+        if zstd_bytes is not None:
+            (self.output_path / 'web_map_data.json.zst').write_bytes(zstd_bytes)
+        else:
+            (self.output_path / 'web_map_data.json.zst').unlink(missing_ok=True)
+        
+        # Also write to web/data/ folder for the web viewer (from memory, no re-read)
         web_data_dir = self.output_path.parent / 'web' / 'data'
         if web_data_dir.exists():
-            shutil.copy(output_file, web_data_dir / 'web_map_data.json')
+            (web_data_dir / 'web_map_data.json').write_bytes(data_bytes)
+            if zstd_bytes is not None:
+                (web_data_dir / 'web_map_data.json.zst').write_bytes(zstd_bytes)
+            else:
+                (web_data_dir / 'web_map_data.json.zst').unlink(missing_ok=True)
         
         return output_file
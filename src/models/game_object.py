@@ -11,7 +11,7 @@ from ..constants import OBJECT_CATEGORIES, get_category, get_detailed_category
 __all__ = ['GameObjectInfo', 'ItemInfo', 'OBJECT_CATEGORIES', 'get_category']
 
 
-@dataclass
+@dataclass(slots=True)
 class GameObjectInfo:
     """Complete information about a placed game object."""
     # Object identification
@@ -11,7 +11,7 @@ from ..constants import NPC_TYPES, NPC_GOALS, NPC_ATTITUDES, get_npc_type_name
 __all__ = ['NPCInfo', 'NPC_TYPES', 'get_npc_type_name']
 
 
-@dataclass
+@dataclass(slots=True)
 class NPCInfo:
     """Complete information about an NPC."""
     # Object identification
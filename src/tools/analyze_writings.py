@@ -16,13 +16,14 @@ Examples:
 """
 
 import sys
-import json
 import argparse
 from pathlib import Path
 
 # Add project root to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from src.exporters import load_json
+
 
 def analyze_from_web_json(web_data_path: Path) -> None:
     """Analyze writings from web_map_data.json."""
@@ -33,8 +34,7 @@ def analyze_from_web_json(web_data_path: Path) -> None:
         print("Run 'make web' to generate web viewer data first.")
         sys.exit(1)
     
-    with open(json_file, 'r') as f:
-        data = json.load(f)
+    data = load_json(json_file)
     
     writings = []
     gravestones = []
@@ -71,8 +71,7 @@ def analyze_from_placed_objects(output_path: Path) -> None:
         print("Run 'python main.py Input/UW1/DATA Output' first.")
         sys.exit(1)
     
-    with open(json_file, 'r') as f:
-        data = json.load(f)
+    data = load_json(json_file)
     
     objects = data.get('objects', data)  # Handle both formats
     
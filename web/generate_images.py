@@ -14,7 +14,6 @@ each object instance to the correct image based on its properties (flags, owner)
 IMPORTANT: Run 'make extract' before 'make images' to generate web_map_data.json.
 """
 
-import json
 import sys
 from pathlib import Path
 
@@ -22,6 +21,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.extractors import ImageExtractor
+from src.exporters import load_json
 
 # Default paths
 DATA_PATH = Path("Input/UW1/DATA")
@@ -43,8 +43,7 @@ def get_placed_object_ids() -> set:
     
     print("Reading web_map_data.json for object IDs used in web viewer...")
     
-    with open(WEB_DATA_PATH, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(WEB_DATA_PATH)
     
     placed_object_ids = set()
     
@@ -2,6 +2,7 @@
 """Simple HTTP server with configurable logging."""
 
 import http.server
+import os
 import socketserver
 import sys
 
@@ -16,6 +17,33 @@ class Handler(http.server.SimpleHTTPRequestHandler):
         if LOG_REQUESTS:
             super().log_message(format, *args)
 
+    def send_head(self):
+        # Serve a pre-compressed .json.zst (written by the exporter) to clients that accept zstd,
+        # as long as it is not older than the .json it was compressed from
+        path = self.translate_path(self.path)
+        accepts_zstd = 'zstd' in self.headers.get('Accept-Encoding', '')
+        if accepts_zstd and path.endswith('.json') and self._zst_is_current(path):
+            try:
+                f = open(path + '.zst', 'rb')
+            except OSError:
+                # Removed or being rewritten by an export since the check - serve the JSON
+                return super().send_head()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Encoding', 'zstd')
+            self.send_header('Content-Length', str(os.fstat(f.fileno()).st_size))
+            self.send_header('Vary', 'Accept-Encoding')
+            self.end_headers()
+            return f
+        return super().send_head()
+
+    @staticmethod
+    def _zst_is_current(path):
+        try:
+            return os.path.getmtime(path + '.zst') >= os.path.getmtime(path)
+        except OSError:
+            return False
+
 
 with socketserver.TCPServer(('', PORT), Handler) as httpd:
     print(f"Serving at http://localhost:{PORT}")